@@ -17,6 +17,13 @@ import os
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 BLOOM_MODEL_PATH = os.path.join(BASE_DIR, 'apps', 'klasifikasi', 'roberta_multilabel')
+# INT8 dynamic quantization of the classifier's Linear layers (faster on CPU)
+BLOOM_QUANTIZE = False
+# Frozen TorchScript trace of the classifier for inference
+BLOOM_TORCHSCRIPT = False
+# Serve the classifier through ONNX Runtime (needs onnxruntime and a model.onnx
+# written by `python manage.py export_onnx`)
+BLOOM_ONNX = False
 
 AUTH_USER_MODEL = 'users.User'
 # Quick-start development settings - unsuitable for production
@@ -2,9 +2,20 @@
 
 import re
 import logging
+import functools
+import threading
 
 logger = logging.getLogger(__name__)
 
+# ASCII characters that Unicode \s matches but re.ASCII's does not
+_ASCII_UNSAFE_RE = re.compile(r'[\x1c-\x1f]')
+
+
+def _union(patterns, flags):
+    """One alternation matching wherever any of patterns matches"""
+    return re.compile('|'.join(f'(?:{p})' for p in patterns), flags)
+
+
 class EnglishBloomAdjuster:
     """
     V5: Fix for "Who Created/Proposed" historical questions
@@ -36,7 +47,9 @@ class EnglishBloomAdjuster:
         r'\b(?:philosophy|model|method|methodology|technique|approach)\s+(?:is\s+)?(?:proposed|introduced)\s+by\b',
         
         # "X proposed the Y" (asking what X proposed)
-        r'\b[\w\s]+\s+proposed\s+(?:the\s+)?[\w\s]+\s+(?:model|method|theory|concept)',
+        # \w\s+X matches exactly where the original \b[\w\s]+\s+X did
+        # (some word right before the spaces), without the quadratic scan
+        r'\w\s+proposed\s+(?:the\s+)?[\w\s]+\s+(?:model|method|theory|concept)',
         
         # "Father/Founder of X is..."
         r'\b(?:father|founder|creator|inventor)\s+of\s+[\w\s]+\s+is\b',
@@ -66,10 +79,12 @@ class EnglishBloomAdjuster:
         
         # "X refers to..."
         r'\brefers\s+to\s+(?:a|an|the)?\b',
-        r'\b[\w\s]+\s+refers\s+to\b',
+        # Linear form of \b[\w\s]+\s+X (see HISTORICAL_CREATOR_PATTERNS)
+        r'\w\s+refers\s+to\b',
         
         # "X means..."
-        r'\b[\w\s]+\s+means\s*:?\b',
+        # Linear form of \b[\w\s]+\s+X (see HISTORICAL_CREATOR_PATTERNS)
+        r'\w\s+means\s*:?\b',
         r'\bwhat\s+does\s+[\w\s]+\s+mean\s*\??$',
     ]
     
@@ -77,13 +92,13 @@ class EnglishBloomAdjuster:
     # Acronym questions are always C1 recall
     ACRONYM_PATTERNS = [
         r'\bstands\s+for\b',
-        r'\bwhat\s+does\s+[A-Z]{2,}\s+stand\s+for\b',
-        r'\b[A-Z]{2,}\s+stands\s+for\b',
-        r'\bwhat\s+is\s+[A-Z]{2,}\s*\??$',
-        r'\b[A-Z]{2,}\s+(?:is\s+)?(?:an?\s+)?acronym\s+for\b',
-        r'\bexpand\s+(?:the\s+)?(?:acronym\s+)?[A-Z]{2,}\b',
-        r'\bfull\s+form\s+of\s+[A-Z]{2,}\b',
-        r'\b[A-Z]{2,}\s+(?:is\s+)?short\s+for\b',
+        r'\bwhat\s+does\s+[a-z]{2,}\s+stand\s+for\b',
+        r'\b[a-z]{2,}\s+stands\s+for\b',
+        r'\bwhat\s+is\s+[a-z]{2,}\s*\??$',
+        r'\b[a-z]{2,}\s+(?:is\s+)?(?:an?\s+)?acronym\s+for\b',
+        r'\bexpand\s+(?:the\s+)?(?:acronym\s+)?[a-z]{2,}\b',
+        r'\bfull\s+form\s+of\s+[a-z]{2,}\b',
+        r'\b[a-z]{2,}\s+(?:is\s+)?short\s+for\b',
     ]
     
     # ========== TECHNICAL TERMINOLOGY TRAPS ==========
@@ -97,7 +112,8 @@ class EnglishBloomAdjuster:
         # Security terminology
         r'\bthe\s+[\w\s]+\s+can\s+be\s+poisoned',
         r'\bwhat\s+(?:is\s+)?[\w\s]*poisoning',
-        r'\b[\w\s]+\s+poisoning\s+(?:is|attack|vulnerability)',
+        # Linear form of \b[\w\s]+\s+X (see HISTORICAL_CREATOR_PATTERNS)
+        r'\w\s+poisoning\s+(?:is|attack|vulnerability)',
         r'\bvulnerability\s+(?:called|known\s+as|named)',
         
         # Network terminology
@@ -130,7 +146,8 @@ class EnglishBloomAdjuster:
         # "Is/are" definition patterns
         r'\bwhat\s+is\s+(?:a|an|the)\s+[\w\s]+\s*\??$',
         r'\bwhat\s+are\s+[\w\s]+\s*\??$',
-        r'\b[\w\s]+\s+(?:is|are)\s*\.?\s*$',
+        # Linear form of \b[\w\s]+\s+X (see HISTORICAL_CREATOR_PATTERNS)
+        r'\w\s+(?:is|are)\s*\.?\s*$',
         r'\bthis\s+is\s+(?:called|known\s+as)',
         
         # Fill-in-blank / completion
@@ -225,7 +242,8 @@ class EnglishBloomAdjuster:
         
         # Security definitions
         r'\bwhat\s+is\s+[\w\s]*poisoning',
-        r'\b[\w\s]+\s+poisoning\s+(?:is\s+)?(?:a|an)\s+(?:type|form)',
+        # Linear form of \b[\w\s]+\s+X (see HISTORICAL_CREATOR_PATTERNS)
+        r'\w\s+poisoning\s+(?:is\s+)?(?:a|an)\s+(?:type|form)',
         
         # Analysis type identification
         r'\btype\s+of\s+analysis\s+(?:is|that|which)',
@@ -302,7 +320,7 @@ class EnglishBloomAdjuster:
         r'\bin\s+what\s+situation\s+would\s+you',
         r'\bdemonstrate\s+how\s+(?:to|you\s+would)',
         r'\bshow\s+how\s+(?:to|you\s+would)',
-        r'\busing\s+(?:the\s+)?(?:OSI\s+model|version\s+control|Git)',
+        r'\busing\s+(?:the\s+)?(?:osi\s+model|version\s+control|git)',
         r'\bat\s+which\s+layer\s+would\s+you\s+troubleshoot',
         r'\bcalculate\s+the\s+number\s+of',
     ]
@@ -517,56 +535,134 @@ class EnglishBloomAdjuster:
         'propose a', 'build a', 'produce a'
     ]
     
-    def __init__(self):
-        """Compile all patterns"""
+    # Lowercase letters that IGNORECASE still folds onto ASCII ('ı' ~ 'i', 'ſ' ~ 's')
+    CASEFOLD_ONLY_LETTERS = ('\u0131', '\u017f')
+    
+    # Distinct (question, ML level, high confidence, keyword confirm)
+    # decisions kept per adjuster
+    DECISION_CACHE_SIZE = 4096
+    
+    # Log line per adjustment reason, exactly as each stage has always
+    # logged it: (message formatted from ml_level, ml_confidence and
+    # category, only logged when the level changes). Keyword confirmations
+    # were never logged
+    DECISION_LOGS = {
+        'historical_creator_blocker': ("🔒 HISTORICAL CREATOR BLOCK: %(ml_level)s(%(ml_confidence).2f) → C1(0.96)", False),
+        'acronym_blocker': ("🔒 ACRONYM BLOCK: %(ml_level)s(%(ml_confidence).2f) → C1(0.97)", False),
+        'definition_recall_blocker': ("🔒 DEFINITION RECALL BLOCK: C2(%(ml_confidence).2f) → C1(0.95)", False),
+        'technical_term_blocker': ("🔒 TECHNICAL TERM BLOCK: %(ml_level)s(%(ml_confidence).2f) → %(category)s(0.95)", False),
+        'absolute_c1_blocker': ("🔒 ABSOLUTE C1 BLOCK: %(ml_level)s(%(ml_confidence).2f) → C1(0.96)", False),
+        'block_false_c6_descriptive': ("⛔ BLOCK C6→C1: False C6 (descriptive definition)", False),
+        'block_c5_c6_criteria': ("⛔ BLOCK C5/C6→C1: Asking about criteria/basis", False),
+        'block_false_c4': ("⛔ BLOCK FALSE C4→%(category)s: %(ml_level)s(%(ml_confidence).2f) → %(category)s", False),
+        'Detected strong Create pattern (Rule-based override)': (
+            "✓ ADJUSTED: %(ml_level)s → %(category)s | Reason: Strong Pattern", True),
+        'Detected strong Evaluate pattern (Rule-based override)': (
+            "✓ ADJUSTED: %(ml_level)s → %(category)s | Reason: Strong Pattern", True),
+        'Detected strong Analyze pattern (Rule-based override)': (
+            "✓ ADJUSTED: %(ml_level)s → %(category)s | Reason: Strong Pattern", True),
+        'Detected strong Apply pattern (Rule-based override)': (
+            "✓ ADJUSTED: %(ml_level)s → %(category)s | Reason: Strong Pattern", True),
+        'Detected strong Understand pattern (Rule-based override)': (
+            "✓ ADJUSTED: %(ml_level)s → %(category)s | Reason: Strong Pattern", True),
+        'Detected strong Remember pattern (Rule-based override)': (
+            "✓ ADJUSTED: %(ml_level)s → %(category)s | Reason: Strong Pattern", True),
+    }
+    
+    # Confidence for a rule match on each level, before the boosts
+    BASE_CONFIDENCE = {'C1': 0.95, 'C2': 0.90, 'C3': 0.87, 'C4': 0.89, 'C5': 0.91, 'C6': 0.93}
+    
+    @classmethod
+    def _compile_all(cls):
+        """Compile all patterns once at import; every instance shares them"""
+        cls._compile_patterns(cls, re.ASCII)
+    
+    # (attribute suffix, pattern list) for every list; each gets an any_*
+    # alternation for presence checks
+    PATTERN_LISTS = (
         # V5 NEW patterns
-        self.compiled_historical_creator = [re.compile(p, re.IGNORECASE) for p in self.HISTORICAL_CREATOR_PATTERNS]
-        self.compiled_definition_recall = [re.compile(p, re.IGNORECASE) for p in self.DEFINITION_RECALL_PATTERNS]
-        self.compiled_acronym = [re.compile(p, re.IGNORECASE) for p in self.ACRONYM_PATTERNS]
-        
-        self.compiled_technical_blockers = [re.compile(p, re.IGNORECASE) for p in self.TECHNICAL_TERM_BLOCKERS]
-        self.compiled_absolute_c1 = [re.compile(p, re.IGNORECASE) for p in self.ABSOLUTE_C1_BLOCKERS]
-        self.compiled_force_c1 = [re.compile(p, re.IGNORECASE) for p in self.FORCE_C1_PATTERNS]
-        self.compiled_force_c2 = [re.compile(p, re.IGNORECASE) for p in self.FORCE_C2_PATTERNS]
-        self.compiled_force_c3 = [re.compile(p, re.IGNORECASE) for p in self.FORCE_C3_PATTERNS]
-        self.compiled_force_c4 = [re.compile(p, re.IGNORECASE) for p in self.FORCE_C4_PATTERNS]
-        self.compiled_force_c5 = [re.compile(p, re.IGNORECASE) for p in self.FORCE_C5_PATTERNS]
-        self.compiled_force_c6 = [re.compile(p, re.IGNORECASE) for p in self.FORCE_C6_PATTERNS]
-        
-        self.compiled_not_c1 = [re.compile(p, re.IGNORECASE) for p in self.NOT_C1_PATTERNS]
-        self.compiled_not_c2 = [re.compile(p, re.IGNORECASE) for p in self.NOT_C2_PATTERNS]
-        self.compiled_not_c3 = [re.compile(p, re.IGNORECASE) for p in self.NOT_C3_PATTERNS]
-        self.compiled_not_c4 = [re.compile(p, re.IGNORECASE) for p in self.NOT_C4_PATTERNS]
-        self.compiled_not_c5 = [re.compile(p, re.IGNORECASE) for p in self.NOT_C5_PATTERNS]
-        
-        self.compiled_block_c5_c6 = [re.compile(p, re.IGNORECASE) for p in self.BLOCK_C5_C6_IF_ASKING_ABOUT]
-        self.compiled_block_c6_desc = [re.compile(p, re.IGNORECASE) for p in self.BLOCK_C6_DESCRIPTIVE]
+        ('historical_creator', 'HISTORICAL_CREATOR_PATTERNS'),
+        ('definition_recall', 'DEFINITION_RECALL_PATTERNS'),
+        ('acronym', 'ACRONYM_PATTERNS'),
+        
+        ('technical_blocker', 'TECHNICAL_TERM_BLOCKERS'),
+        ('absolute_c1', 'ABSOLUTE_C1_BLOCKERS'),
+        ('force_c1', 'FORCE_C1_PATTERNS'),
+        ('force_c2', 'FORCE_C2_PATTERNS'),
+        ('force_c3', 'FORCE_C3_PATTERNS'),
+        ('force_c4', 'FORCE_C4_PATTERNS'),
+        ('force_c5', 'FORCE_C5_PATTERNS'),
+        ('force_c6', 'FORCE_C6_PATTERNS'),
+        
+        ('not_c1', 'NOT_C1_PATTERNS'),
+        ('not_c2', 'NOT_C2_PATTERNS'),
+        ('not_c3', 'NOT_C3_PATTERNS'),
+        ('not_c4', 'NOT_C4_PATTERNS'),
+        ('not_c5', 'NOT_C5_PATTERNS'),
+        
+        ('block_c5_c6', 'BLOCK_C5_C6_IF_ASKING_ABOUT'),
+        ('block_c6_desc', 'BLOCK_C6_DESCRIPTIVE'),
         
         # V5.1 NEW
-        self.compiled_block_false_c4 = [re.compile(p, re.IGNORECASE) for p in self.BLOCK_FALSE_C4_PATTERNS]
+        ('block_false_c4', 'BLOCK_FALSE_C4_PATTERNS'),
+    )
+    
+    # Lists _check_level also counts pattern by pattern, so they keep a
+    # compiled_* list next to their alternation
+    COUNTED_LISTS = ('force_c1', 'force_c2', 'force_c3', 'force_c4', 'force_c5', 'force_c6')
+    
+    @staticmethod
+    def _compile_patterns(target, flags):
+        """Compile every pattern list onto target (the class or one instance)"""
+        for name, list_name in target.PATTERN_LISTS:
+            patterns = getattr(target, list_name)
+            # One alternation per list: re scans the text once for all of
+            # them, several times faster than a search each
+            setattr(target, 'any_' + name, _union(patterns, flags))
+            if name in target.COUNTED_LISTS:
+                setattr(target, 'compiled_' + name, [re.compile(p, flags) for p in patterns])
+    
+    def __init__(self, flags=re.ASCII):
+        """Patterns are lowercase and matched against lowercased text"""
+        self.flags = flags
+        # Lazily built Unicode / IGNORECASE instances, keyed by their flags
+        self._fallback_adjusters = {}
+        
+        # Only the fallback instances need their own compiled copy
+        if flags != re.ASCII:
+            self._compile_patterns(self, flags)
+        
+        # Re-scoring a question bank sees the same questions again; the
+        # stage decisions are pure, so keep the recent ones per adjuster
+        self._cached_decision = functools.lru_cache(maxsize=self.DECISION_CACHE_SIZE)(self._decide)
+    
+    def clear_decision_cache(self):
+        """Forget cached decisions, the fallback instances' too"""
+        self._cached_decision.cache_clear()
+        for fallback in self._fallback_adjusters.values():
+            fallback.clear_decision_cache()
     
     def _has_false_c4_pattern(self, text):
         """V5.1: Check if question looks like C4 but is actually C1/C2/C3"""
-        return any(p.search(text) for p in self.compiled_block_false_c4)
+        return self.any_block_false_c4.search(text) is not None
     
     def _has_historical_creator_pattern(self, text):
         """V5: Check if question asks about historical creator/proposer"""
-        return any(p.search(text) for p in self.compiled_historical_creator)
+        return self.any_historical_creator.search(text) is not None
     
     def _has_definition_recall_pattern(self, text):
         """V5: Check if question is simple definition recall"""
-        return any(p.search(text) for p in self.compiled_definition_recall)
+        return self.any_definition_recall.search(text) is not None
     
     def _has_acronym_pattern(self, text):
         """V5: Check if question asks for acronym expansion"""
-        return any(p.search(text) for p in self.compiled_acronym)
+        return self.any_acronym.search(text) is not None
     
-    def _boost_confidence(self, category, ml_confidence, pattern_strength, keyword_count):
+    def _boost_confidence(self, category, high_confidence, pattern_strength, keyword_count):
         """Boost confidence based on pattern strength"""
-        base = {'C1': 0.95, 'C2': 0.90, 'C3': 0.87, 'C4': 0.89, 'C5': 0.91, 'C6': 0.93}
-        confidence = base.get(category, 0.85)
+        confidence = self.BASE_CONFIDENCE.get(category, 0.85)
         
-        if ml_confidence > 0.70:
+        if high_confidence:
             confidence = min(0.98, confidence + 0.05)
         
         if pattern_strength >= 2 or keyword_count >= 3:
@@ -577,196 +673,234 @@ class EnglishBloomAdjuster:
         
         return confidence
     
+    def _adjuster_for(self, question_lower):
+        """Instance whose compiled patterns handle question_lower"""
+        # Patterns are compiled with re.ASCII, whose \b, \w and \s agree with
+        # Unicode ones on plain ASCII text and skip the property lookups; any
+        # other text goes to a Unicode instance. Without IGNORECASE 'ı'/'ſ'
+        # would no longer match 'i'/'s', so text containing them keeps that
+        if self.flags != re.ASCII or (question_lower.isascii()
+                                      and not _ASCII_UNSAFE_RE.search(question_lower)):
+            return self
+        
+        if any(letter in question_lower for letter in self.CASEFOLD_ONLY_LETTERS):
+            flags = re.IGNORECASE
+        else:
+            flags = re.UNICODE
+        fallback = self._fallback_adjusters.get(flags)
+        if fallback is None:
+            fallback = self._fallback_adjusters[flags] = EnglishBloomAdjuster(flags=flags)
+        return fallback
+    
     def adjust_classification(self, question_text, ml_prediction):
         """V5: Enhanced with historical creator/proposer blocking"""
         question_lower = question_text.lower().strip()
         
+        adjuster = self._adjuster_for(question_lower)
+        if adjuster is not self:
+            return adjuster.adjust_classification(question_text, ml_prediction)
+        
         ml_level = ml_prediction['category']
         ml_confidence = ml_prediction['confidence']
         
+        # _boost_confidence only looks at the ML confidence through > 0.70
+        high_confidence = ml_confidence > 0.70
+        category, name, confidence, reason, was_adjusted, keyword_only = self._cached_decision(
+            question_lower, ml_level, high_confidence, True)
+        
+        # Keywords alone only stand when they raise the ML confidence;
+        # otherwise the question goes on through the lower levels
+        if keyword_only and not confidence > ml_confidence:
+            category, name, confidence, reason, was_adjusted, keyword_only = self._cached_decision(
+                question_lower, ml_level, high_confidence, False)
+        
+        if reason == 'ml_kept':
+            name = ml_prediction.get('category_name', '')
+            confidence = ml_confidence
+        else:
+            self._log_decision(reason, ml_level, ml_confidence, category)
+        
+        return {
+            'category': category,
+            'category_name': name,
+            'confidence': confidence,
+            'all_probabilities': ml_prediction.get('all_probabilities', {}),
+            'adjustment_reason': reason,
+            'ml_category': ml_level,
+            'ml_confidence': ml_confidence,
+            'was_adjusted': was_adjusted
+        }
+    
+    def _log_decision(self, reason, ml_level, ml_confidence, category):
+        """Log an adjustment with its stage's message (see DECISION_LOGS)"""
+        if reason not in self.DECISION_LOGS or not logger.isEnabledFor(logging.INFO):
+            return
+        
+        message, only_changes = self.DECISION_LOGS[reason]
+        if only_changes and category == ml_level:
+            return
+        logger.info(message, {'ml_level': ml_level, 'ml_confidence': ml_confidence, 'category': category})
+    
+    def _decide(self, question_lower, ml_level, high_confidence, keyword_confirm):
+        """
+        Stage 0 → 8 decision logic for one question
+        
+        Returns (category, category_name, confidence, reason, was_adjusted,
+        keyword_only), with reason 'ml_kept' when the ML prediction stands.
+        keyword_only marks a keyword confirmation of the ML level, which the
+        caller checks against the exact ML confidence; keyword_confirm=False
+        skips those. Pure in its arguments, so __init__ wraps it in an LRU cache.
+        """
         # ====== STAGE 0A: V5 NEW - HISTORICAL CREATOR BLOCKER ======
         # "Who proposed/created X?" is ALWAYS C1, never C6
         if self._has_historical_creator_pattern(question_lower):
             if ml_level in ['C6', 'C5', 'C4', 'C3']:
-                logger.info(f"🔒 HISTORICAL CREATOR BLOCK: {ml_level}({ml_confidence:.2f}) → C1(0.96)")
-                return self._create_result('C1', 'Remember', 0.96, ml_prediction,
-                                          'historical_creator_blocker', ml_level, ml_confidence)
+                return self._result('C1', 'Remember', 0.96, 'historical_creator_blocker', ml_level)
         
         # ====== STAGE 0B: V5 NEW - ACRONYM BLOCKER ======
         # "X stands for" is ALWAYS C1
         if self._has_acronym_pattern(question_lower):
             if ml_level != 'C1':
-                logger.info(f"🔒 ACRONYM BLOCK: {ml_level}({ml_confidence:.2f}) → C1(0.97)")
-                return self._create_result('C1', 'Remember', 0.97, ml_prediction,
-                                          'acronym_blocker', ml_level, ml_confidence)
+                return self._result('C1', 'Remember', 0.97, 'acronym_blocker', ml_level)
         
         # ====== STAGE 0C: V5 NEW - DEFINITION RECALL BLOCKER ======
         # "X is defined as" is C1, not C2
         if self._has_definition_recall_pattern(question_lower):
             if ml_level == 'C2':
-                logger.info(f"🔒 DEFINITION RECALL BLOCK: C2({ml_confidence:.2f}) → C1(0.95)")
-                return self._create_result('C1', 'Remember', 0.95, ml_prediction,
-                                          'definition_recall_blocker', ml_level, ml_confidence)
+                return self._result('C1', 'Remember', 0.95, 'definition_recall_blocker', ml_level)
         
         # ====== STAGE 0D: TECHNICAL TERMINOLOGY BLOCKERS ======
-        technical_block_count = sum(1 for p in self.compiled_technical_blockers if p.search(question_lower))
-        
-        if technical_block_count >= 1:
+        if self.any_technical_blocker.search(question_lower):
             if ml_level in ['C3', 'C4', 'C5', 'C6']:
                 target = 'C2' if any(word in question_lower for word in ['why', 'how does', 'what causes']) else 'C1'
                 target_name = 'Understand' if target == 'C2' else 'Remember'
-                logger.info(f"🔒 TECHNICAL TERM BLOCK: {ml_level}({ml_confidence:.2f}) → {target}(0.95)")
-                return self._create_result(target, target_name, 0.95, ml_prediction,
-                                          'technical_term_blocker', ml_level, ml_confidence)
+                return self._result(target, target_name, 0.95, 'technical_term_blocker', ml_level)
         
         # ====== STAGE 0E: ABSOLUTE C1 BLOCKERS ======
-        absolute_c1_count = sum(1 for p in self.compiled_absolute_c1 if p.search(question_lower))
-        
-        if absolute_c1_count >= 1:
-            logger.info(f"🔒 ABSOLUTE C1 BLOCK: {ml_level}({ml_confidence:.2f}) → C1(0.96)")
-            return self._create_result('C1', 'Remember', 0.96, ml_prediction,
-                                      'absolute_c1_blocker', ml_level, ml_confidence)
+        if self.any_absolute_c1.search(question_lower):
+            return self._result('C1', 'Remember', 0.96, 'absolute_c1_blocker', ml_level)
         
         # ====== STAGE 1: BLOCK FALSE C6 (DESCRIPTIVE SYSTEMS) ======
         if ml_level == 'C6':
-            if any(p.search(question_lower) for p in self.compiled_block_c6_desc):
-                logger.info(f"⛔ BLOCK C6→C1: False C6 (descriptive definition)")
-                return self._create_result('C1', 'Remember', 0.94, ml_prediction,
-                                           'block_false_c6_descriptive', ml_level, ml_confidence)
+            if self.any_block_c6_desc.search(question_lower):
+                return self._result('C1', 'Remember', 0.94, 'block_false_c6_descriptive', ml_level)
         
         # ====== STAGE 2: BLOCK C5/C6 IF ASKING ABOUT CRITERIA/BASIS ======
-        if any(p.search(question_lower) for p in self.compiled_block_c5_c6):
+        if self.any_block_c5_c6.search(question_lower):
             if ml_level in ['C5', 'C6']:
-                logger.info(f"⛔ BLOCK C5/C6→C1: Asking about criteria/basis")
-                return self._create_result('C1', 'Remember', 0.93, ml_prediction,
-                                           'block_c5_c6_criteria', ml_level, ml_confidence)
+                return self._result('C1', 'Remember', 0.93, 'block_c5_c6_criteria', ml_level)
         
         # ====== STAGE 2.5: V5.1 NEW - BLOCK FALSE C4 ======
         # "Which command is correct" or "What happens if" are NOT analysis
-        if ml_level == 'C4' or any(p.search(question_lower) for p in self.compiled_force_c4):
+        if ml_level == 'C4' or self.any_force_c4.search(question_lower):
             if self._has_false_c4_pattern(question_lower):
                 # Determine target: C1 for syntax, C2 for consequences
                 if any(word in question_lower for word in ['command', 'statement', 'query', 'syntax', 'correct']):
                     target, target_name = 'C1', 'Remember'
                 else:
                     target, target_name = 'C2', 'Understand'
-                logger.info(f"⛔ BLOCK FALSE C4→{target}: {ml_level}({ml_confidence:.2f}) → {target}")
-                return self._create_result(target, target_name, 0.92, ml_prediction,
-                                           'block_false_c4', ml_level, ml_confidence)
+                return self._result(target, target_name, 0.92, 'block_false_c4', ml_level)
         
         # ====== STAGE 3: CHECK C6 (CREATE) ======
-        result = self._check_level(question_lower, self.compiled_force_c6,
-                                   self.C6_KEYWORDS, [],
-                                   ml_level, 'C6', 'Create', ml_confidence, ml_prediction)
+        result = self._check_level(question_lower, self.compiled_force_c6, self.any_force_c6,
+                                   self.C6_KEYWORDS, None,
+                                   ml_level, 'C6', 'Create', high_confidence, keyword_confirm)
         if result:
             return result
         
         # ====== STAGE 4: CHECK C5 (EVALUATE) ======
-        result = self._check_level(question_lower, self.compiled_force_c5,
-                                   self.C5_KEYWORDS, self.compiled_not_c5,
-                                   ml_level, 'C5', 'Evaluate', ml_confidence, ml_prediction)
+        result = self._check_level(question_lower, self.compiled_force_c5, self.any_force_c5,
+                                   self.C5_KEYWORDS, self.any_not_c5,
+                                   ml_level, 'C5', 'Evaluate', high_confidence, keyword_confirm)
         if result:
             return result
         
         # ====== STAGE 5: CHECK C4 (ANALYZE) ======
-        result = self._check_level(question_lower, self.compiled_force_c4,
-                                   self.C4_KEYWORDS, self.compiled_not_c4,
-                                   ml_level, 'C4', 'Analyze', ml_confidence, ml_prediction)
+        result = self._check_level(question_lower, self.compiled_force_c4, self.any_force_c4,
+                                   self.C4_KEYWORDS, self.any_not_c4,
+                                   ml_level, 'C4', 'Analyze', high_confidence, keyword_confirm)
         if result:
             return result
         
         # ====== STAGE 6: CHECK C3 (APPLY) ======
-        result = self._check_level(question_lower, self.compiled_force_c3,
-                                   self.C3_KEYWORDS, self.compiled_not_c3,
-                                   ml_level, 'C3', 'Apply', ml_confidence, ml_prediction)
+        result = self._check_level(question_lower, self.compiled_force_c3, self.any_force_c3,
+                                   self.C3_KEYWORDS, self.any_not_c3,
+                                   ml_level, 'C3', 'Apply', high_confidence, keyword_confirm)
         if result:
             return result
         
         # ====== STAGE 7: CHECK C2 (UNDERSTAND) ======
-        result = self._check_level(question_lower, self.compiled_force_c2,
-                                   self.C2_KEYWORDS, self.compiled_not_c2,
-                                   ml_level, 'C2', 'Understand', ml_confidence, ml_prediction)
+        result = self._check_level(question_lower, self.compiled_force_c2, self.any_force_c2,
+                                   self.C2_KEYWORDS, self.any_not_c2,
+                                   ml_level, 'C2', 'Understand', high_confidence, keyword_confirm)
         if result:
             return result
         
         # ====== STAGE 8: CHECK C1 (REMEMBER) ======
-        result = self._check_level(question_lower, self.compiled_force_c1,
-                                   self.C1_KEYWORDS, self.compiled_not_c1,
-                                   ml_level, 'C1', 'Remember', ml_confidence, ml_prediction)
+        result = self._check_level(question_lower, self.compiled_force_c1, self.any_force_c1,
+                                   self.C1_KEYWORDS, self.any_not_c1,
+                                   ml_level, 'C1', 'Remember', high_confidence, keyword_confirm)
         if result:
             return result
         
         # ====== STAGE 9: DEFAULT - KEEP ML PREDICTION ======
-        return {
-            'category': ml_level,
-            'category_name': ml_prediction.get('category_name', ''),
-            'confidence': ml_confidence,
-            'all_probabilities': ml_prediction.get('all_probabilities', {}),
-            'adjustment_reason': 'ml_kept',
-            'ml_category': ml_level,
-            'ml_confidence': ml_confidence,
-            'was_adjusted': False
-        }
+        return (ml_level, None, None, 'ml_kept', False, False)
     
-    def _check_level(self, text, patterns, keywords, anti_patterns,
-                     current_ml_level, target_level, level_name, ml_confidence, ml_prediction):
+    def _check_level(self, text, patterns, any_pattern, keywords, any_anti_pattern,
+                     current_ml_level, target_level, level_name, high_confidence, keyword_confirm):
         """Helper to check patterns for specific level"""
-        if any(p.search(text) for p in anti_patterns):
+        if any_anti_pattern is not None and any_anti_pattern.search(text):
             return None
         
-        pattern_strength = sum(1 for p in patterns if p.search(text))
+        # Only count pattern by pattern once the union says something matches;
+        # _boost_confidence only tells 1 from 2 or more, so stop at 2
+        pattern_strength = 0
+        if any_pattern.search(text):
+            for p in patterns:
+                if p.search(text):
+                    pattern_strength += 1
+                    if pattern_strength >= 2:
+                        break
         keyword_count = sum(1 for k in keywords if k in text)
         
-        result = None
-        
         if pattern_strength > 0:
-            new_conf = self._boost_confidence(target_level, ml_confidence, pattern_strength, keyword_count)
-            result = {
-                'category': target_level,
-                'category_name': level_name,
-                'confidence': new_conf,
-                'all_probabilities': ml_prediction.get('all_probabilities', {}),
-                'adjustment_reason': f"Detected strong {level_name} pattern (Rule-based override)",
-                'ml_category': current_ml_level,
-                'ml_confidence': ml_confidence,
-                'was_adjusted': True
-            }
-            
-            if target_level != current_ml_level:
-                logger.info(f"✓ ADJUSTED: {current_ml_level} → {target_level} | Reason: Strong Pattern")
+            new_conf = self._boost_confidence(target_level, high_confidence, pattern_strength, keyword_count)
+            return (target_level, level_name, new_conf,
+                    f"Detected strong {level_name} pattern (Rule-based override)", True, False)
         
-        elif current_ml_level == target_level and keyword_count > 0:
-            new_conf = self._boost_confidence(target_level, ml_confidence, 0, keyword_count)
-            
-            if new_conf > ml_confidence:
-                result = {
-                    'category': target_level,
-                    'category_name': level_name,
-                    'confidence': new_conf,
-                    'all_probabilities': ml_prediction.get('all_probabilities', {}),
-                    'adjustment_reason': f"ML prediction confirmed by {level_name} keywords",
-                    'ml_category': current_ml_level,
-                    'ml_confidence': ml_confidence,
-                    'was_adjusted': True
-                }
-        
-        return result
-    
-    def _create_result(self, category, name, confidence, ml_pred, reason, ml_cat, ml_conf):
-        """Helper to create result dictionary"""
-        return {
-            'category': category,
-            'category_name': name,
-            'confidence': confidence,
-            'all_probabilities': ml_pred.get('all_probabilities', {}),
-            'adjustment_reason': reason,
-            'ml_category': ml_cat,
-            'ml_confidence': ml_conf,
-            'was_adjusted': category != ml_cat
-        }
+        if keyword_confirm and current_ml_level == target_level and keyword_count > 0:
+            new_conf = self._boost_confidence(target_level, high_confidence, 0, keyword_count)
+            return (target_level, level_name, new_conf,
+                    f"ML prediction confirmed by {level_name} keywords", True, True)
+        
+        return None
+    
+    @staticmethod
+    def _result(category, name, confidence, reason, ml_level):
+        """Decision tuple for a blocker stage"""
+        return (category, name, confidence, reason, category != ml_level, False)
+
+
+EnglishBloomAdjuster._compile_all()
+
+
+# Global instance - also keeps the lazily built IGNORECASE fallback
+_adjuster_instance = None
+_adjuster_lock = threading.Lock()
+
+def get_adjuster():
+    """
+    Get or create the global adjuster instance (safe across request threads)
+    """
+    global _adjuster_instance
+    if _adjuster_instance is None:
+        with _adjuster_lock:
+            if _adjuster_instance is None:
+                _adjuster_instance = EnglishBloomAdjuster()
+    return _adjuster_instance
 
 
 def adjust_classification_with_patterns(question_text, ml_prediction):
     """Convenience function for English pattern adjustment"""
-    adjuster = EnglishBloomAdjuster()
+    adjuster = get_adjuster()
     return adjuster.adjust_classification(question_text, ml_prediction)
\ No newline at end of file
@@ -2,9 +2,382 @@
 
 import re
 import logging
+import functools
+import threading
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
 
 logger = logging.getLogger(__name__)
 
+# Optional: Hyperscan scans a whole pattern group in one pass
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# Optional: Aho-Corasick finds all gate words of a group in one pass
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Optional: an RE2 set matches a whole pattern group in one linear-time pass
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+
+def _collect_hyperscan_id(pattern_id, start, end, flags, context):
+    """Hyperscan match callback: remember which pattern fired, stop at the limit"""
+    matched, limit = context
+    matched.add(pattern_id)
+    return len(matched) >= limit
+
+
+def _build_hyperscan_database(patterns):
+    """Compile a pattern group into one Hyperscan database, or None"""
+    if not HYPERSCAN_AVAILABLE:
+        return None
+    
+    database = hyperscan.Database()
+    try:
+        database.compile(
+            expressions=[p.encode('ascii') for p in patterns],
+            ids=list(range(len(patterns))),
+            flags=hyperscan.HS_FLAG_SINGLEMATCH,
+        )
+    except hyperscan.error as e:
+        # e.g. lookarounds are not supported - keep this group on re
+        logger.debug("Hyperscan cannot compile pattern group: %s", e)
+        return None
+    return database
+
+
+def _build_re2_set(patterns):
+    """Compile a pattern group into one RE2 search set, or None"""
+    if not RE2_AVAILABLE:
+        return None
+    
+    # RE2 has no lookarounds; such groups stay on re
+    if any(marker in p for p in patterns for marker in ('(?=', '(?!', '(?<')):
+        return None
+    
+    pattern_set = re2.Set.SearchSet()
+    try:
+        for p in patterns:
+            pattern_set.Add(p)
+        pattern_set.Compile()
+    except re2.error as e:
+        logger.debug("RE2 cannot compile pattern group: %s", e)
+        return None
+    return pattern_set
+
+
+# ASCII whitespace that re's \s matches but Hyperscan's or RE2's does not,
+# and a trailing newline (re's $ also matches just before it)
+_DFA_UNSAFE_RE = re.compile(r'[\x0b\x1c-\x1f]|\n\Z')
+
+# Lowercase letters that IGNORECASE still folds onto ASCII ('ı' ~ 'i',
+# 'ſ' ~ 's'); text containing them is matched case-insensitively
+_CASEFOLD_ONLY_LETTERS = ('\u0131', '\u017f')
+
+
+def _literal_alternatives(parsed):
+    """
+    Literals of which at least one must appear in any match of parsed
+    
+    Returns a set of lowercase strings, or None when no literal of at
+    least 3 characters is guaranteed. Only plain sequences, groups,
+    alternations and repeats with min >= 1 are looked into.
+    """
+    candidates = []
+    run = []
+    
+    def flush():
+        if run:
+            candidates.append({''.join(run).lower()})
+            run.clear()
+    
+    for op, av in parsed:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        flush()
+        if op is sre_parse.SUBPATTERN:
+            candidates.append(_literal_alternatives(av[-1]))
+        elif op is sre_parse.BRANCH:
+            branches = [_literal_alternatives(branch) for branch in av[1]]
+            if all(branches):
+                candidates.append(set().union(*branches))
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+            body = list(av[2])
+            if len(body) == 1 and body[0][0] is sre_parse.LITERAL:
+                # e.g. \.{3,} needs '...'
+                candidates.append({chr(body[0][1]) * av[0]})
+            else:
+                candidates.append(_literal_alternatives(av[2]))
+    flush()
+    
+    candidates = [c for c in candidates if c and min(map(len, c)) >= 3]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda c: min(map(len, c)))
+
+
+# Punctuation an end-anchored pattern may allow after its last word
+_TAIL_PUNCTUATION = '.?:'
+
+
+def _suffix_kind(parsed):
+    """'space' or 'punctuation' if parsed only ever consumes that, else None"""
+    kinds = set()
+    for op, av in parsed:
+        if op is sre_parse.LITERAL and chr(av) in _TAIL_PUNCTUATION:
+            kinds.add('punctuation')
+        elif op is sre_parse.IN:
+            for item_op, item_av in av:
+                if item_op is sre_parse.LITERAL and chr(item_av) in _TAIL_PUNCTUATION:
+                    kinds.add('punctuation')
+                elif item_op is sre_parse.CATEGORY and item_av is sre_parse.CATEGORY_SPACE:
+                    kinds.add('space')
+                else:
+                    return None
+        else:
+            return None
+    return kinds.pop() if len(kinds) == 1 else None
+
+
+def _literal_tail(parsed):
+    """
+    Word every match of an end-anchored pattern ends the text with
+    
+    Only optional whitespace, then optional _TAIL_PUNCTUATION, then optional
+    whitespace may follow the word, as in the '... kecuali :' blocker:
+    exactly what count() strips off the text before comparing. Returns
+    None for any other shape, or a word ending in whitespace or punctuation.
+    """
+    items = list(parsed)
+    if not items or items[-1] != (sre_parse.AT, sre_parse.AT_END):
+        return None
+    items.pop()
+    
+    # From the end: whitespace, then punctuation, then whitespace again
+    phases = ('space', 'punctuation', 'space')
+    phase = 0
+    while (items and items[-1][0] in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT)
+           and items[-1][1][0] == 0):
+        kind = _suffix_kind(items[-1][1][2])
+        while phase < len(phases) and phases[phase] != kind:
+            phase += 1
+        if phase == len(phases):
+            return None
+        items.pop()
+    
+    run = []
+    while items and items[-1][0] is sre_parse.LITERAL:
+        run.append(chr(items.pop()[1]))
+    tail = ''.join(reversed(run))
+    if len(tail) < 3 or tail[-1].isspace() or tail[-1] in _TAIL_PUNCTUATION:
+        return None
+    return tail
+
+
+class LiteralScanner:
+    """
+    One Aho-Corasick automaton over the gate words of one or more groups
+    
+    Remembers (per thread) the last text it scanned, so groups sharing a
+    scanner pay for a single pass over the same question.
+    """
+    
+    __slots__ = ('automaton', '_local')
+    
+    def __init__(self, literals):
+        self.automaton = ahocorasick.Automaton()
+        for literal in literals:
+            self.automaton.add_word(literal, literal)
+        self.automaton.make_automaton()
+        self._local = threading.local()
+    
+    def find(self, text):
+        """Set of gate words present in text"""
+        local = self._local
+        if getattr(local, 'text', None) is not text:
+            local.found = {literal for _, literal in self.automaton.iter(text)}
+            local.text = text
+        return local.found
+
+
+class PatternGroup:
+    """
+    One list of patterns that is matched or counted as a whole
+    
+    Patterns are written in lowercase and matched against lowercased
+    text, so they are compiled without re.IGNORECASE.
+    
+    Text shorter than the group's shortest possible match is rejected
+    by length alone. Every pattern that needs some literal word (see _literal_alternatives)
+    is only searched when one of those words is in the text, and the
+    whole group is skipped when none of its words is. With pyahocorasick
+    installed those words are found in one automaton pass instead of one
+    substring search each. When Hyperscan or RE2 is installed the group
+    is scanned by a Hyperscan database or an RE2 set instead.
+    
+    With casefold, text containing 'ı' or 'ſ' is matched with
+    re.IGNORECASE, as the original IGNORECASE-compiled lists were.
+    """
+    
+    __slots__ = (
+        'patterns', 'casefold', 'compiled', '_casefold_compiled', 'gated', 'min_length',
+        'required_literals', 'literal_scanner', 'hyperscan_database', '_hyperscan_local',
+        're2_set',
+    )
+    
+    def __init__(self, patterns, casefold=True):
+        self.patterns = patterns
+        self.casefold = casefold
+        self.compiled = tuple(re.compile(p) for p in patterns)
+        self._casefold_compiled = None
+        
+        # (compiled pattern, literal words it needs or None, word the text
+        # must end with or None)
+        self.gated = []
+        required = set()
+        widths = []
+        for pattern, compiled in zip(patterns, self.compiled):
+            parsed = sre_parse.parse(pattern)
+            widths.append(parsed.getwidth()[0])
+            alternatives = _literal_alternatives(parsed)
+            if alternatives is None:
+                required = None
+            elif required is not None:
+                required |= alternatives
+            self.gated.append((compiled, tuple(sorted(alternatives)) if alternatives else None,
+                               _literal_tail(parsed)))
+        self.gated = tuple(self.gated)
+        self.min_length = min(widths, default=0)
+        self.required_literals = tuple(sorted(required)) if required is not None else None
+        self.literal_scanner = self._build_literal_scanner()
+        
+        self.hyperscan_database = _build_hyperscan_database(patterns)
+        self._hyperscan_local = threading.local()
+        self.re2_set = _build_re2_set(patterns) if self.hyperscan_database is None else None
+    
+    def count(self, text, limit=2):
+        """Number of distinct patterns matching text, capped at limit"""
+        # Shorter than the shortest possible match of any pattern
+        if len(text) < self.min_length:
+            return 0
+        
+        # Literal gates; IGNORECASE folds a few non-ASCII letters onto ASCII
+        # ones (e.g. 'ſ' → 's'), so only ASCII text can be rejected this way
+        is_ascii = text.isascii()
+        found = None
+        if is_ascii and self.literal_scanner is not None:
+            found = self.literal_scanner.find(text)
+            if self.required_literals is not None and found.isdisjoint(self.required_literals):
+                return 0
+        elif is_ascii and self.required_literals is not None:
+            if not any(literal in text for literal in self.required_literals):
+                return 0
+        
+        # Hyperscan's and RE2's \b, \w and \s are ASCII-only, so only
+        # plain ASCII text is handed to them to keep identical semantics
+        if (is_ascii and (self.hyperscan_database is not None or self.re2_set is not None)
+                and _DFA_UNSAFE_RE.search(text) is None):
+            if self.hyperscan_database is None:
+                # Match() gives the matching pattern indices, or None
+                return min(len(self.re2_set.Match(text) or ()), limit)
+            matched = set()
+            try:
+                self.hyperscan_database.scan(text.encode('ascii'), match_event_handler=_collect_hyperscan_id,
+                                             context=(matched, limit), scratch=self._hyperscan_scratch())
+            except hyperscan.ScanTerminated:
+                pass
+            return len(matched)
+        
+        if self.casefold and not is_ascii and any(letter in text for letter in _CASEFOLD_ONLY_LETTERS):
+            return self._count_casefold(text, limit)
+        
+        # Text with trailing whitespace and punctuation cut off, for the
+        # end-anchored patterns (computed on first use)
+        ending = None
+        
+        count = 0
+        for compiled, literals, tail in self.gated:
+            if is_ascii and literals is not None:
+                if found is not None:
+                    if found.isdisjoint(literals):
+                        continue
+                elif not any(literal in text for literal in literals):
+                    continue
+            if is_ascii and tail is not None:
+                if ending is None:
+                    ending = text.rstrip().rstrip(_TAIL_PUNCTUATION).rstrip()
+                if not ending.endswith(tail):
+                    continue
+            if compiled.search(text):
+                count += 1
+                if count >= limit:
+                    break
+        return count
+    
+    def _count_casefold(self, text, limit):
+        """count() for the rare text where re.IGNORECASE still makes a difference"""
+        if self._casefold_compiled is None:
+            self._casefold_compiled = tuple(re.compile(p, re.IGNORECASE) for p in self.patterns)
+        
+        count = 0
+        for compiled in self._casefold_compiled:
+            if compiled.search(text):
+                count += 1
+                if count >= limit:
+                    break
+        return count
+    
+    def matches(self, text):
+        """True if any pattern of the group matches text"""
+        return self.count(text, limit=1) > 0
+    
+    def _gate_literals(self):
+        """Every gate word of the group"""
+        return {literal for _, gate, _ in self.gated if gate for literal in gate}
+    
+    def _build_literal_scanner(self):
+        """Aho-Corasick scanner over every gate word, or None"""
+        if not AHOCORASICK_AVAILABLE:
+            return None
+        
+        literals = self._gate_literals()
+        if not literals:
+            return None
+        return LiteralScanner(literals)
+    
+    @staticmethod
+    def share_literal_scanner(groups):
+        """Give groups one scanner, so a text is scanned once for all of them"""
+        groups = [group for group in groups if group.literal_scanner is not None]
+        if not groups:
+            return
+        
+        scanner = LiteralScanner(set().union(*(group._gate_literals() for group in groups)))
+        for group in groups:
+            group.literal_scanner = scanner
+    
+    def _hyperscan_scratch(self):
+        """Per-thread scratch space, Hyperscan scratch is not thread-safe"""
+        scratch = getattr(self._hyperscan_local, 'scratch', None)
+        if scratch is None:
+            scratch = self._hyperscan_local.scratch = hyperscan.Scratch(self.hyperscan_database)
+        return scratch
+
 
 class IndonesianBloomAdjuster:
     """
@@ -21,7 +394,7 @@ class IndonesianBloomAdjuster:
     
     # ========== V8 NEW: PASSIVE VOICE FACT PATTERNS ==========
     # These describe WHAT HAPPENED, not what student must DO
-    PASSIVE_FACT_PATTERNS = [
+    PASSIVE_FACT_PATTERNS = (
         # "Proposed by" / "Said by" patterns - asking WHO said it
         r'\bdikemukakan\s+oleh\b',
         r'\bdikatakan\s+oleh\b', 
@@ -51,21 +424,21 @@ class IndonesianBloomAdjuster:
         r'\bditetapkan\s+dalam\b',
         r'\bdimuat\s+dalam\b',
         r'\btercantum\s+dalam\b',
-    ]
+    )
     
     # ========== V8 NEW: PROHIBITION/RULE CONTEXT ==========
     # Questions about what is PROHIBITED/REQUIRED - these are recall
-    PROHIBITION_RULE_PATTERNS = [
+    PROHIBITION_RULE_PATTERNS = (
         r'\bdilarang\s+(?:untuk\s+)?(?:membuat|melakukan|mencantumkan)',
         r'\btidak\s+(?:boleh|diperbolehkan|diizinkan)\s+(?:untuk\s+)?',
         r'\bharus\s+memenuhi\s+(?:syarat|ketentuan|kriteria)',
         r'\bwajib\s+(?:untuk\s+)?(?:memenuhi|mematuhi)',
         r'\bapabila\s+menyatakan\b',  # "if stating..." in prohibition context
-    ]
+    )
     
     # ========== V8 NEW: ARTICLE/LAW CITATION PATTERNS ==========
     # "According to Article X" - usually recall, not application
-    ARTICLE_CITATION_RECALL = [
+    ARTICLE_CITATION_RECALL = (
         r'\bmenurut\s+pasal\s+\d+',
         r'\bberdasarkan\s+pasal\s+\d+',
         r'\bsesuai\s+(?:dengan\s+)?pasal\s+\d+',
@@ -75,11 +448,11 @@ class IndonesianBloomAdjuster:
         # Asking WHICH article number
         r'\bdiatur\s+dalam\s+pasal\s*$',
         r'\btercantum\s+dalam\s+pasal\s*$',
-    ]
+    )
     
     # ========== V8 NEW: WHO/WHAT/WHERE QUESTION MARKERS ==========
     # These indicate factual recall, not higher-order thinking
-    WHO_WHAT_WHERE_MARKERS = [
+    WHO_WHAT_WHERE_MARKERS = (
         # WHO questions
         r'\boleh\s+siapa\b',
         r'\bsiapa\s+(?:yang|saja)\b',
@@ -95,23 +468,26 @@ class IndonesianBloomAdjuster:
         r'\bdengan\s+nama\s*$',
         r'\bsebagai\s+apa\b',
         r'\bapa\s+(?:nama|istilah|sebutan)nya\b',
-    ]
+    )
     
     # ========== ULTRA-PRIORITY: C1 DEFINITION BLOCKERS ==========
-    ABSOLUTE_C1_BLOCKERS = [
+    ABSOLUTE_C1_BLOCKERS = (
+        # (?:^|[^\w\s])\s*\w[\w\s]* below is \b[\w\s]+ tried only from the start
+        # of each word run - same matches, but linear instead of quadratic
+        
         # "Disebut" patterns - ALWAYS C1
         r'\bdisebut\s+(?:sebagai\s+)?(?:apa|apakah)\s*\??$',
         r'\b(?:apa|apakah)\s+yang\s+disebut\b',
-        r'\b[\w\s]+\s+disebut\s*\??$',
+        r'(?:^|[^\w\s])\s*\w[\w\s]*\s+disebut\s*\??$',
         r'\bdinamakan\s+(?:apa|apakah)',
         r'\bdikenal\s+sebagai\s+(?:apa|apakah)',
         r'\bapa\s+(?:nama|istilah|sebutan)\s+(?:dari|untuk)',
         
         # "Adalah" definition patterns - ALWAYS C1
-        r'\b[\w\s]+\s+adalah\s*\.?\s*$',
+        r'(?:^|[^\w\s])\s*\w[\w\s]*\s+adalah\s*\.?\s*$',
         r'\byang\s+dimaksud\s+(?:dengan\s+)?[\w\s]+\s+adalah\s*$',
-        r'\b[\w\s]+\s+merupakan\s*\.?\s*$',
-        r'\b[\w\s]+\s+ialah\s*\.?\s*$',
+        r'(?:^|[^\w\s])\s*\w[\w\s]*\s+merupakan\s*\.?\s*$',
+        r'(?:^|[^\w\s])\s*\w[\w\s]*\s+ialah\s*\.?\s*$',
         
         # Fill-in-blank/completion
         r'\.{3,}',
@@ -150,10 +526,10 @@ class IndonesianBloomAdjuster:
         r'\bdikemukakan\s+oleh\s*$',
         r'\bdikenal\s+dengan\s+nama\s*$',
         r'\bdisampaikan\s+kepada\s*$',
-    ]
+    )
     
     # ========== C1 (REMEMBER) - COMPREHENSIVE PATTERNS ==========
-    FORCE_C1_PATTERNS = [
+    FORCE_C1_PATTERNS = (
         # === Core definition patterns ===
         r'\bpengertian\s+(?:yang\s+)?(?:paling\s+)?(?:umum|utama|dari|tentang)',
         r'\bdefinisi\s+(?:dari|tentang|yang)',
@@ -197,7 +573,7 @@ class IndonesianBloomAdjuster:
         r'\bprotokol\s+(?:yang\s+)?(?:digunakan|adalah)',
         r'\bmedia\s+(?:transmisi|penyimpanan)\s+[\w\s]+\s+adalah',
         r'\btopologi\s+(?:jaringan\s+)?yang',
-        r'\blayer\s+(?:OSI\s+)?yang',
+        r'\blayer\s+(?:osi\s+)?yang',
         
         # === "Adalah...berikut" patterns ===
         r'\badalah\s+(?:sebagai\s+)?berikut',
@@ -227,10 +603,10 @@ class IndonesianBloomAdjuster:
         r'\bdapat\s+berasal\s+dari',
         r'\bbiasa\s+digunakan\s+oleh',
         r'\bartinya\s+sebagai',
-    ]
+    )
     
     # ========== C2 (UNDERSTAND) PATTERNS ==========
-    FORCE_C2_PATTERNS = [
+    FORCE_C2_PATTERNS = (
         # === Relationship understanding ===
         r'\byang\s+dimaksud\s+(?:dengan\s+)?relevansi(?!\s+adalah)',
         r'\baksesibilitas\s+(?:dapat\s+)?mempengaruhi',
@@ -274,10 +650,10 @@ class IndonesianBloomAdjuster:
         # === V8 NEW: Understanding basis/reasoning ===
         r'\bdidasarkan\s+pada\b',
         r'\batas\s+dasar\b',
-    ]
+    )
     
     # ========== C3 (APPLY) - MUST BE IMPERATIVE ==========
-    FORCE_C3_PATTERNS = [
+    FORCE_C3_PATTERNS = (
         r'\bterapkan(?:lah)?\s+',
         r'\bgunakan(?:lah)?\s+[\w\s]+\s+untuk\s+(?:menghitung|menyelesaikan)',
         r'\bhitunglah\b',
@@ -287,10 +663,10 @@ class IndonesianBloomAdjuster:
         
         # === Application scenarios ===
         r'\bpenggunaan\s+[\w\s]+\s+untuk\s+(?:menghubungkan|transaksi)',
-    ]
+    )
     
     # ========== C4 (ANALYZE) - MUST BE IMPERATIVE + ANALYTICAL ==========
-    FORCE_C4_PATTERNS = [
+    FORCE_C4_PATTERNS = (
         r'\banalisis(?:lah)?\s+(?:penyebab|faktor|komponen|struktur)',
         r'\bteliti\s+(?:pola|struktur)',
         r'\bbandingkan\s+dan\s+kontraskan',
@@ -299,10 +675,10 @@ class IndonesianBloomAdjuster:
         
         # === Analytical challenges ===
         r'\bperusahaan\s+harus\s+berhadapan\s+dengan',
-    ]
+    )
     
     # ========== C5 (EVALUATE) - MUST BE IMPERATIVE + JUDGMENT ==========
-    FORCE_C5_PATTERNS = [
+    FORCE_C5_PATTERNS = (
         r'\bevaluasi(?:lah)?\s+(?:efektivitas|kualitas|kelayakan)',
         r'\bnilai(?:lah)?\s+(?:efektivitas|kelayakan)',
         r'\bpertimbangkan\s+[\w\s]+\s+untuk\s+memilih',
@@ -311,10 +687,10 @@ class IndonesianBloomAdjuster:
         r'\bapa\s+yang\s+(?:lebih|paling)\s+(?:baik|efektif)',
         r'\bmana\s+yang\s+lebih\s+baik',
         r'\bputuskan\s+(?:apakah|mana)',
-    ]
+    )
     
     # ========== C6 (CREATE) - MUST BE IMPERATIVE + CREATIVE ==========
-    FORCE_C6_PATTERNS = [
+    FORCE_C6_PATTERNS = (
         r'\brancang(?:lah)?\s+(?:sebuah|suatu)\s+(?:sistem|model)',
         r'\bdesain(?:lah)?\s+(?:sebuah|suatu)',
         r'\bbuatlah\s+(?:sistem|model|rancangan)',
@@ -322,18 +698,18 @@ class IndonesianBloomAdjuster:
         r'\bciptakan\b',
         r'\bsusun(?:lah)?\s+(?:rencana|strategi|sistem)',
         r'\busulkan\s+(?:desain|rancangan)',
-    ]
+    )
     
     # ========== CRITICAL: BLOCK FALSE C5/C6 ==========
-    BLOCK_C5_C6_IF_ASKING_ABOUT = [
+    BLOCK_C5_C6_IF_ASKING_ABOUT = (
         r'\bmelalui\s+kriteria',
         r'\bdengan\s+kriteria',
         r'\bmenggunakan\s+kriteria',
         r'\bkriteria\s+(?:yang|untuk|evaluasi)',
         r'\bdasar\s+(?:untuk\s+)?opini',
-    ]
+    )
     
-    BLOCK_C6_DESCRIPTIVE = [
+    BLOCK_C6_DESCRIPTIVE = (
         # These describe systems, not ask to create them
         r'\bsistem\s+(?:yang\s+)?(?:menghasilkan|mengintegrasikan|melintasi)',
         r'\bperangkat\s+lunak\s+(?:dasar|sistem)',
@@ -346,258 +722,345 @@ class IndonesianBloomAdjuster:
         r'\bdikembangkan\s+menjadi',
         r'\bkemudian\s+dikenal\s+dengan',
         r'\bdikenal\s+dengan\s+nama',
-    ]
+    )
     
     # ========== V8 NEW: BLOCK FALSE C3 (APPLY) ==========
-    BLOCK_C3_ARTICLE_RECALL = [
+    BLOCK_C3_ARTICLE_RECALL = (
         # Article number questions - recall, not apply
         r'\bmenurut\s+pasal\s+\d+\s+[\w\s]+,\s+[\w\s]+\s+sesuai\s+dengan',
         r'\bsebagaimana\s+diatur\s+dalam\s+pasal',
-        r'\bKUH\s*(?:Perdata|Pidana)\s+mengatur',
-        r'\bUndang-undang\s+[\w\s]+\s+(?:mengatur|menyatakan)',
+        r'\bkuh\s*(?:perdata|pidana)\s+mengatur',
+        r'\bundang-undang\s+[\w\s]+\s+(?:mengatur|menyatakan)',
         # Asking what law says
         r'\bmenurut\s+[\w\s]+,\s+[\w\s]+\s+dianggap',
         r'\bmenurut\s+[\w\s]+,\s+pengertian',
-    ]
+    )
     
-    def __init__(self):
-        """Compile all patterns"""
-        self.compiled_absolute_c1 = [re.compile(p, re.IGNORECASE) for p in self.ABSOLUTE_C1_BLOCKERS]
-        self.compiled_force_c1 = [re.compile(p, re.IGNORECASE) for p in self.FORCE_C1_PATTERNS]
-        self.compiled_force_c2 = [re.compile(p, re.IGNORECASE) for p in self.FORCE_C2_PATTERNS]
-        self.compiled_force_c3 = [re.compile(p, re.IGNORECASE) for p in self.FORCE_C3_PATTERNS]
-        self.compiled_force_c4 = [re.compile(p, re.IGNORECASE) for p in self.FORCE_C4_PATTERNS]
-        self.compiled_force_c5 = [re.compile(p, re.IGNORECASE) for p in self.FORCE_C5_PATTERNS]
-        self.compiled_force_c6 = [re.compile(p, re.IGNORECASE) for p in self.FORCE_C6_PATTERNS]
-        
-        self.compiled_block_c5_c6 = [re.compile(p, re.IGNORECASE) for p in self.BLOCK_C5_C6_IF_ASKING_ABOUT]
-        self.compiled_block_c6_desc = [re.compile(p, re.IGNORECASE) for p in self.BLOCK_C6_DESCRIPTIVE]
+    # Matched as whole words, each optionally followed by the -lah/-kah
+    # particle (see _compile_all), so 'susunlah' counts but 'penilaian' does not
+    IMPERATIVE_VERBS = (
+        'hitunglah', 'terapkan', 'gunakan', 'selesaikan', 'buatlah',
+        'rancanglah', 'evaluasilah', 'analisislah', 'bandingkan',
+        'klasifikasikan', 'susun', 'kembangkan', 'ciptakan',
+        'identifikasi', 'nilai', 'tentukan', 'jelaskan', 'uraikan'
+    )
+    
+    DECLARATIVE_ENDINGS = ('adalah', 'merupakan', 'ialah', 'yaitu', 'disebut', 'termasuk')
+    
+    DECLARATIVE_PATTERNS = (
+        r'\b(?:adalah|merupakan|ialah)\s+[\w\s]+$',
+        r'\bdisebut\s+(?:apa|apakah|sebagai)?\s*\??$',
+        r'\btermasuk\s+(?:dalam\s+)?kategori',
+        r'\.{3,}',
+    )
+    
+    # Compiled pattern groups are class attributes (see _compile_all)
+    __slots__ = ('c1_block_stages', 'force_stages', '_cached_decision', '_declarative_memo')
+    
+    # Distinct (question, ML level, low confidence) decisions kept per adjuster
+    DECISION_CACHE_SIZE = 4096
+    
+    # Log line per adjustment reason, exactly as each stage has always
+    # logged it: (message formatted from ml_level, ml_confidence, category
+    # and confidence, only logged when the level changes)
+    DECISION_LOGS = {
+        'absolute_c1_blocker': ("🔒 ABSOLUTE C1 BLOCK: %(ml_level)s(%(ml_confidence).2f) → C1(0.96)", False),
+        'kecuali_question': ("🔒 KECUALI QUESTION: %(ml_level)s(%(ml_confidence).2f) → C1(0.97)", False),
+        'passive_fact_to_c1': ("⛔ PASSIVE FACT→C1: %(ml_level)s(%(ml_confidence).2f) → C1", False),
+        'who_what_where_to_c1': ("⛔ WHO/WHAT/WHERE→C1: %(ml_level)s(%(ml_confidence).2f) → C1", False),
+        'prohibition_context_to_c1': ("⛔ PROHIBITION CONTEXT→C1: %(ml_level)s(%(ml_confidence).2f) → C1", False),
+        'article_citation_to_c1': ("⛔ ARTICLE CITATION→C1: C3(%(ml_confidence).2f) → C1", False),
+        'block_c3_article_recall': ("⛔ BLOCK C3→C1: Article recall pattern", False),
+        'block_false_c6_descriptive': ("⛔ BLOCK C6→C1: False C6 (descriptive definition)", False),
+        'block_c5_c6_criteria': ("⛔ BLOCK C5/C6→C1: Asking about criteria/basis", False),
+        'declarative_downgrade': ("⛔ DECLARATIVE→C1: %(ml_level)s → C1 (declarative form)", False),
+        'force_c1_pattern': ("✓ FORCE C1: %(ml_level)s(%(ml_confidence).2f) → C1(%(confidence).2f)", True),
+        'force_c2_pattern': ("✓ FORCE C2: %(ml_level)s(%(ml_confidence).2f) → C2(%(confidence).2f)", True),
+        'force_c3_pattern': ("✓ FORCE C3: %(ml_level)s(%(ml_confidence).2f) → C3(%(confidence).2f)", True),
+        'force_c4_pattern': ("✓ FORCE C4: %(ml_level)s(%(ml_confidence).2f) → C4(%(confidence).2f)", True),
+        'force_c5_pattern': ("✓ FORCE C5: %(ml_level)s(%(ml_confidence).2f) → C5(%(confidence).2f)", True),
+        'force_c6_pattern': ("✓ FORCE C6: %(ml_level)s(%(ml_confidence).2f) → C6(%(confidence).2f)", True),
+        'downgrade_uncertain': ("⬇️ DOWNGRADE: %(ml_level)s(%(ml_confidence).2f) → %(category)s", False),
+        'final_c6_block_no_imperative': ("⛔ FINAL C6 BLOCK: No imperative verb → C1", False),
+    }
+    
+    # Confidence for a FORCE pattern hit, before the multi-pattern boost
+    BASE_CONFIDENCE = {'C1': 0.95, 'C2': 0.90, 'C3': 0.87, 'C4': 0.89, 'C5': 0.91, 'C6': 0.93}
+    
+    @classmethod
+    def _compile_all(cls):
+        """Compile all patterns once at import; every instance shares them"""
+        cls.absolute_c1 = PatternGroup(cls.ABSOLUTE_C1_BLOCKERS)
+        cls.force_c1 = PatternGroup(cls.FORCE_C1_PATTERNS)
+        cls.force_c2 = PatternGroup(cls.FORCE_C2_PATTERNS)
+        cls.force_c3 = PatternGroup(cls.FORCE_C3_PATTERNS)
+        cls.force_c4 = PatternGroup(cls.FORCE_C4_PATTERNS)
+        cls.force_c5 = PatternGroup(cls.FORCE_C5_PATTERNS)
+        cls.force_c6 = PatternGroup(cls.FORCE_C6_PATTERNS)
+        
+        cls.block_c5_c6 = PatternGroup(cls.BLOCK_C5_C6_IF_ASKING_ABOUT)
+        cls.block_c6_desc = PatternGroup(cls.BLOCK_C6_DESCRIPTIVE)
         
         # V8 NEW
-        self.compiled_passive_fact = [re.compile(p, re.IGNORECASE) for p in self.PASSIVE_FACT_PATTERNS]
-        self.compiled_prohibition = [re.compile(p, re.IGNORECASE) for p in self.PROHIBITION_RULE_PATTERNS]
-        self.compiled_article_citation = [re.compile(p, re.IGNORECASE) for p in self.ARTICLE_CITATION_RECALL]
-        self.compiled_who_what_where = [re.compile(p, re.IGNORECASE) for p in self.WHO_WHAT_WHERE_MARKERS]
-        self.compiled_block_c3 = [re.compile(p, re.IGNORECASE) for p in self.BLOCK_C3_ARTICLE_RECALL]
+        cls.passive_fact = PatternGroup(cls.PASSIVE_FACT_PATTERNS)
+        cls.prohibition = PatternGroup(cls.PROHIBITION_RULE_PATTERNS)
+        cls.article_citation = PatternGroup(cls.ARTICLE_CITATION_RECALL)
+        cls.who_what_where = PatternGroup(cls.WHO_WHAT_WHERE_MARKERS)
+        cls.block_c3 = PatternGroup(cls.BLOCK_C3_ARTICLE_RECALL)
+        # Always matched case-sensitively, unlike the lists above
+        cls.declarative = PatternGroup(cls.DECLARATIVE_PATTERNS, casefold=False)
+        
+        # Gate words of every group are found in one pass per question
+        PatternGroup.share_literal_scanner([
+            cls.absolute_c1, cls.force_c1, cls.force_c2, cls.force_c3, cls.force_c4,
+            cls.force_c5, cls.force_c6, cls.block_c5_c6, cls.block_c6_desc, cls.passive_fact,
+            cls.prohibition, cls.article_citation, cls.who_what_where, cls.block_c3,
+            cls.declarative,
+        ])
+        
+        # Case-sensitive on purpose: runs on lowercased text. Whole words
+        # only, so 'digunakan' or 'menilai' are not read as 'gunakan'/'nilai';
+        # the -lah/-kah particles keep 'susunlah' or 'jelaskanlah' imperative
+        cls.imperative_verb_re = re.compile(r'\b(?:' + '|'.join(cls.IMPERATIVE_VERBS) + r')(?:lah|kah)?\b')
     
-    def _has_imperative_verb(self, text):
-        """Check if question has imperative verb directed at student"""
-        imperative_verbs = [
-            'hitunglah', 'terapkan', 'gunakan', 'selesaikan', 'buatlah',
-            'rancanglah', 'evaluasilah', 'analisislah', 'bandingkan',
-            'klasifikasikan', 'susun', 'kembangkan', 'ciptakan',
-            'identifikasi', 'nilai', 'tentukan', 'jelaskan', 'uraikan'
+    def __init__(self):
+        """Build the stage tables over the shared compiled patterns"""
+        # Stages 1-5, the C2 block and Stage 7 may all ask about the same
+        # question; remember the last answer instead of matching again
+        self._declarative_memo = functools.lru_cache(maxsize=1)(self._is_declarative)
+        
+        # Stage 1 → 5 as data: (levels, check, confidence, reason)
+        c1_block_stages = [
+            (('C6', 'C5', 'C4', 'C3'), self._has_passive_fact_pattern, 0.95, 'passive_fact_to_c1'),
+            (('C6', 'C5', 'C4', 'C3'), self._has_who_what_where, 0.94, 'who_what_where_to_c1'),
+            (('C6', 'C5', 'C4', 'C3'), self._has_prohibition_context, 0.94, 'prohibition_context_to_c1'),
+            (('C3',), self._has_article_citation, 0.94, 'article_citation_to_c1'),
+            (('C3',), self._has_article_recall, 0.93, 'block_c3_article_recall'),
+            (('C6',), self._has_descriptive_definition, 0.94, 'block_false_c6_descriptive'),
+            (('C5', 'C6'), self._asks_about_criteria, 0.93, 'block_c5_c6_criteria'),
+            (('C3', 'C4', 'C5', 'C6'), self._declarative_memo, 0.94, 'declarative_downgrade'),
         ]
-        text_lower = text.lower()
-        return any(verb in text_lower for verb in imperative_verbs)
+        # Dispatch table keyed on the ML level, so a question only runs the
+        # stage checks that could actually change its prediction
+        self.c1_block_stages = {
+            level: tuple(stage for stage in c1_block_stages if level in stage[0])
+            for level in ('C1', 'C2', 'C3', 'C4', 'C5', 'C6')
+        }
+        
+        # Stage 6 as data: (level, name, group, reason, needs_imperative, blocked_by)
+        self.force_stages = (
+            ('C1', 'Remember', self.force_c1, 'force_c1_pattern', False, None),
+            ('C2', 'Understand', self.force_c2, 'force_c2_pattern', False, self._declarative_memo),
+            ('C3', 'Apply', self.force_c3, 'force_c3_pattern', True, None),
+            ('C4', 'Analyze', self.force_c4, 'force_c4_pattern', True, None),
+            ('C5', 'Evaluate', self.force_c5, 'force_c5_pattern', True, None),
+            ('C6', 'Create', self.force_c6, 'force_c6_pattern', True, None),
+        )
+        
+        # Decisions only depend on (question, ML level, confidence < 0.70),
+        # so re-scored or re-imported questions skip the regex work
+        self._cached_decision = functools.lru_cache(maxsize=self.DECISION_CACHE_SIZE)(self._decide)
     
-    def _is_declarative(self, text):
+    def clear_decision_cache(self):
+        """Forget cached decisions, e.g. to time the uncached path"""
+        self._cached_decision.cache_clear()
+        self._declarative_memo.cache_clear()
+    
+    def _has_imperative_verb(self, text_lower):
+        """Check if question has imperative verb directed at student"""
+        return self.imperative_verb_re.search(text_lower) is not None
+    
+    def _is_declarative(self, text_lower):
         """Check if question uses declarative form"""
-        text_lower = text.lower().strip()
-        
         # Check endings
-        endings = ['adalah', 'merupakan', 'ialah', 'yaitu', 'disebut', 'termasuk']
-        if any(text_lower.endswith(e) for e in endings):
+        if text_lower.endswith(self.DECLARATIVE_ENDINGS):
             return True
         
         # Check patterns
-        declarative_patterns = [
-            r'\b(?:adalah|merupakan|ialah)\s+[\w\s]+$',
-            r'\bdisebut\s+(?:apa|apakah|sebagai)?\s*\??$',
-            r'\btermasuk\s+(?:dalam\s+)?kategori',
-            r'\.{3,}',
-        ]
-        return any(re.search(p, text_lower) for p in declarative_patterns)
+        return self.declarative.matches(text_lower)
     
     def _has_passive_fact_pattern(self, text):
         """V8: Check if question contains passive voice describing facts"""
-        return any(p.search(text) for p in self.compiled_passive_fact)
+        return self.passive_fact.matches(text)
     
     def _has_prohibition_context(self, text):
         """V8: Check if question is about rules/prohibitions"""
-        return any(p.search(text) for p in self.compiled_prohibition)
+        return self.prohibition.matches(text)
     
     def _has_article_citation(self, text):
         """V8: Check if question cites specific legal article"""
-        return any(p.search(text) for p in self.compiled_article_citation)
+        return self.article_citation.matches(text)
     
     def _has_who_what_where(self, text):
         """V8: Check if question asks WHO/WHAT/WHERE"""
-        return any(p.search(text) for p in self.compiled_who_what_where)
+        return self.who_what_where.matches(text)
     
-    def _is_kecuali_question(self, text):
+    def _has_article_recall(self, text):
+        """V8: Check if question recalls what an article/law states"""
+        return self.block_c3.matches(text)
+    
+    def _has_descriptive_definition(self, text):
+        """Check if question describes a system rather than asking to create one"""
+        return self.block_c6_desc.matches(text)
+    
+    def _asks_about_criteria(self, text):
+        """Check if question asks about criteria/basis instead of judging"""
+        return self.block_c5_c6.matches(text)
+    
+    def _is_kecuali_question(self, text_lower):
         """V8: Check if question is 'kecuali' (except) type - always C1"""
-        text_lower = text.lower()
         return 'kecuali' in text_lower
     
     def _boost_confidence(self, category, pattern_count):
         """Boost confidence based on pattern strength"""
-        base = {'C1': 0.95, 'C2': 0.90, 'C3': 0.87, 'C4': 0.89, 'C5': 0.91, 'C6': 0.93}
-        confidence = base.get(category, 0.85)
+        confidence = self.BASE_CONFIDENCE.get(category, 0.85)
         if pattern_count >= 2:
             confidence = min(0.97, confidence + 0.02)
         return confidence
     
     def adjust_classification(self, question_text, ml_prediction):
         """V8: Anti-hallucination logic with legal/historical context awareness"""
-        question_lower = question_text.lower().strip()
+        return self._adjust_single(question_text.lower().strip(), ml_prediction)
+    
+    def adjust_classification_batch(self, questions, ml_predictions):
+        """
+        Adjust a list of questions, one result per question
         
+        Gives the same results as adjust_classification on each question
+        in turn: every question still goes through its own stage decision
+        (or a decision cache hit). Raises ValueError when the two lists
+        differ in length.
+        """
+        if len(questions) != len(ml_predictions):
+            raise ValueError("questions and ml_predictions must have the same length")
+        
+        questions_lower = [q.lower().strip() for q in questions]
+        
+        return [
+            self._adjust_single(question_lower, ml_prediction)
+            for question_lower, ml_prediction in zip(questions_lower, ml_predictions)
+        ]
+    
+    def _adjust_single(self, question_lower, ml_prediction):
+        """Build the result dict for one question from its cached decision"""
         ml_level = ml_prediction['category']
-        ml_confidence = ml_prediction['confidence']
+        ml_confidence = float(ml_prediction['confidence'])
+        all_probs = ml_prediction.get('all_probabilities', {})
         
-        # ====== STAGE 0: ABSOLUTE C1 BLOCKERS (HIGHEST PRIORITY) ======
-        absolute_c1_count = sum(1 for p in self.compiled_absolute_c1 if p.search(question_lower))
+        # Only the < 0.70 threshold in Stage 7 looks at the ML confidence
+        category, name, confidence, reason = self._cached_decision(
+            question_lower, ml_level, ml_confidence < 0.70)
+        
+        if reason == 'ml_kept':
+            # ====== STAGE 9: KEEP ML PREDICTION ======
+            category = ml_level
+            name = ml_prediction.get('category_name', '')
+            confidence = ml_confidence
+        else:
+            # Logged here rather than in _decide, so cache hits log too
+            self._log_decision(reason, ml_level, ml_confidence, category, confidence)
+        
+        return {
+            'category': category,
+            'category_name': name,
+            'confidence': confidence,
+            'all_probabilities': all_probs,
+            'adjustment_reason': reason,
+            'ml_category': ml_level,
+            'ml_confidence': ml_confidence,
+            'was_adjusted': category != ml_level
+        }
+    
+    def _log_decision(self, reason, ml_level, ml_confidence, category, confidence):
+        """Log an adjustment with its stage's message (see DECISION_LOGS)"""
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
+        message, only_changes = self.DECISION_LOGS[reason]
+        if only_changes and category == ml_level:
+            return
+        logger.info(message, {
+            'ml_level': ml_level,
+            'ml_confidence': ml_confidence,
+            'category': category,
+            'confidence': confidence,
+        })
+    
+    def _decide(self, question_lower, ml_level, low_confidence):
+        """
+        Stage 0 → 8 decision logic for one question
         
-        if absolute_c1_count >= 1:
-            logger.info(f"🔒 ABSOLUTE C1 BLOCK: {ml_level}({ml_confidence:.2f}) → C1(0.96)")
-            return self._create_result('C1', 'Remember', 0.96, ml_prediction,
-                                      'absolute_c1_blocker', ml_level, ml_confidence)
+        Returns (category, category_name, confidence, reason), or
+        reason 'ml_kept' when the ML prediction stands. Pure in its
+        arguments, so __init__ wraps it in an LRU cache.
+        """
+        # ====== STAGE 0: ABSOLUTE C1 BLOCKERS (HIGHEST PRIORITY) ======
+        if self.absolute_c1.matches(question_lower):
+            return ('C1', 'Remember', 0.96, 'absolute_c1_blocker')
         
         # ====== STAGE 0.5: V8 NEW - KECUALI QUESTIONS (ALWAYS C1) ======
-        if self._is_kecuali_question(question_text):
-            logger.info(f"🔒 KECUALI QUESTION: {ml_level}({ml_confidence:.2f}) → C1(0.97)")
-            return self._create_result('C1', 'Remember', 0.97, ml_prediction,
-                                      'kecuali_question', ml_level, ml_confidence)
-        
-        # ====== STAGE 1: V8 NEW - PASSIVE FACT PATTERNS (BLOCK C6/C3) ======
-        if self._has_passive_fact_pattern(question_lower):
-            if ml_level in ['C6', 'C5', 'C4', 'C3']:
-                logger.info(f"⛔ PASSIVE FACT→C1: {ml_level}({ml_confidence:.2f}) → C1")
-                return self._create_result('C1', 'Remember', 0.95, ml_prediction,
-                                          'passive_fact_to_c1', ml_level, ml_confidence)
-        
-        # ====== STAGE 1.5: V8 NEW - WHO/WHAT/WHERE QUESTIONS ======
-        if self._has_who_what_where(question_lower):
-            if ml_level in ['C6', 'C5', 'C4', 'C3']:
-                logger.info(f"⛔ WHO/WHAT/WHERE→C1: {ml_level}({ml_confidence:.2f}) → C1")
-                return self._create_result('C1', 'Remember', 0.94, ml_prediction,
-                                          'who_what_where_to_c1', ml_level, ml_confidence)
-        
-        # ====== STAGE 2: V8 NEW - PROHIBITION/RULE CONTEXT ======
-        if self._has_prohibition_context(question_lower):
-            if ml_level in ['C6', 'C5', 'C4', 'C3']:
-                # Questions about what is prohibited are recall
-                logger.info(f"⛔ PROHIBITION CONTEXT→C1: {ml_level}({ml_confidence:.2f}) → C1")
-                return self._create_result('C1', 'Remember', 0.94, ml_prediction,
-                                          'prohibition_context_to_c1', ml_level, ml_confidence)
-        
-        # ====== STAGE 2.5: V8 NEW - ARTICLE CITATION (BLOCK FALSE C3) ======
-        if self._has_article_citation(question_lower):
-            if ml_level == 'C3':
-                # Asking what an article says is recall, not application
-                logger.info(f"⛔ ARTICLE CITATION→C1: C3({ml_confidence:.2f}) → C1")
-                return self._create_result('C1', 'Remember', 0.94, ml_prediction,
-                                          'article_citation_to_c1', ml_level, ml_confidence)
-        
-        # ====== STAGE 2.6: V8 NEW - BLOCK C3 ARTICLE RECALL ======
-        if any(p.search(question_lower) for p in self.compiled_block_c3):
-            if ml_level == 'C3':
-                logger.info(f"⛔ BLOCK C3→C1: Article recall pattern")
-                return self._create_result('C1', 'Remember', 0.93, ml_prediction,
-                                          'block_c3_article_recall', ml_level, ml_confidence)
-        
-        # ====== STAGE 3: BLOCK FALSE C6 (DESCRIPTIVE SYSTEMS) ======
-        if ml_level == 'C6':
-            if any(p.search(question_lower) for p in self.compiled_block_c6_desc):
-                logger.info(f"⛔ BLOCK C6→C1: False C6 (descriptive definition)")
-                return self._create_result('C1', 'Remember', 0.94, ml_prediction,
-                                          'block_false_c6_descriptive', ml_level, ml_confidence)
-        
-        # ====== STAGE 4: BLOCK C5/C6 IF ASKING ABOUT CRITERIA/BASIS ======
-        if any(p.search(question_lower) for p in self.compiled_block_c5_c6):
-            if ml_level in ['C5', 'C6']:
-                logger.info(f"⛔ BLOCK C5/C6→C1: Asking about criteria/basis")
-                return self._create_result('C1', 'Remember', 0.93, ml_prediction,
-                                          'block_c5_c6_criteria', ml_level, ml_confidence)
-        
-        # ====== STAGE 5: DECLARATIVE ENDING CHECK ======
-        if self._is_declarative(question_text):
-            if ml_level in ['C3', 'C4', 'C5', 'C6']:
-                logger.info(f"⛔ DECLARATIVE→C1: {ml_level} → C1 (declarative form)")
-                return self._create_result('C1', 'Remember', 0.94, ml_prediction,
-                                          'declarative_downgrade', ml_level, ml_confidence)
+        if self._is_kecuali_question(question_lower):
+            return ('C1', 'Remember', 0.97, 'kecuali_question')
+        
+        # ====== STAGE 1 → 5: CONTEXT BLOCKS (→ C1) ======
+        # Passive fact, who/what/where, prohibition, article citation,
+        # article recall, descriptive C6, criteria C5/C6, declarative form
+        for levels, check, confidence, reason in self.c1_block_stages.get(ml_level, ()):
+            if check(question_lower):
+                return ('C1', 'Remember', confidence, reason)
         
         # ====== STAGE 6: PATTERN MATCHING (C1 → C6) ======
+        # C3+ MUST have imperative
+        has_imperative = self._has_imperative_verb(question_lower)
         
-        # C1
-        c1_count = sum(1 for p in self.compiled_force_c1 if p.search(question_lower))
-        if c1_count >= 1:
-            confidence = self._boost_confidence('C1', c1_count)
-            if ml_level != 'C1':
-                logger.info(f"✓ FORCE C1: {ml_level}({ml_confidence:.2f}) → C1({confidence:.2f})")
-            return self._create_result('C1', 'Remember', confidence, ml_prediction,
-                                      'force_c1_pattern', ml_level, ml_confidence)
-        
-        # C2
-        c2_count = sum(1 for p in self.compiled_force_c2 if p.search(question_lower))
-        if c2_count >= 1:
-            if not self._is_declarative(question_text):
-                confidence = self._boost_confidence('C2', c2_count)
-                if ml_level != 'C2':
-                    logger.info(f"✓ FORCE C2: {ml_level}({ml_confidence:.2f}) → C2({confidence:.2f})")
-                return self._create_result('C2', 'Understand', confidence, ml_prediction,
-                                          'force_c2_pattern', ml_level, ml_confidence)
-        
-        # C3+ (MUST have imperative)
-        has_imperative = self._has_imperative_verb(question_text)
-        
-        if has_imperative:
-            for level, patterns, name in [
-                ('C3', self.compiled_force_c3, 'Apply'),
-                ('C4', self.compiled_force_c4, 'Analyze'),
-                ('C5', self.compiled_force_c5, 'Evaluate'),
-                ('C6', self.compiled_force_c6, 'Create'),
-            ]:
-                count = sum(1 for p in patterns if p.search(question_lower))
-                if count >= 1:
-                    confidence = self._boost_confidence(level, count)
-                    if ml_level != level:
-                        logger.info(f"✓ FORCE {level}: {ml_level}({ml_confidence:.2f}) → {level}({confidence:.2f})")
-                    return self._create_result(level, name, confidence, ml_prediction,
-                                              f'force_{level.lower()}_pattern', ml_level, ml_confidence)
+        for level, name, patterns, reason, needs_imperative, blocked_by in self.force_stages:
+            if needs_imperative and not has_imperative:
+                break
+            count = patterns.count(question_lower)
+            if count >= 1 and not (blocked_by and blocked_by(question_lower)):
+                return (level, name, self._boost_confidence(level, count), reason)
         
         # ====== STAGE 7: DOWNGRADE UNCERTAIN HIGH LEVELS ======
-        if ml_level in ['C3', 'C4', 'C5', 'C6'] and ml_confidence < 0.70:
+        if ml_level in ['C3', 'C4', 'C5', 'C6'] and low_confidence:
             if not has_imperative:
-                target = 'C1' if self._is_declarative(question_text) else 'C2'
-                target_name = 'Remember' if target == 'C1' else 'Understand'
-                logger.info(f"⬇️ DOWNGRADE: {ml_level}({ml_confidence:.2f}) → {target}")
-                return self._create_result(target, target_name, 0.80, ml_prediction,
-                                          'downgrade_uncertain', ml_level, ml_confidence)
+                if self._declarative_memo(question_lower):
+                    return ('C1', 'Remember', 0.80, 'downgrade_uncertain')
+                return ('C2', 'Understand', 0.80, 'downgrade_uncertain')
         
         # ====== STAGE 8: V8 NEW - FINAL SAFETY CHECK FOR C6 ======
         # If ML still says C6 but no imperative creative verb, block it
         if ml_level == 'C6' and not has_imperative:
-            logger.info(f"⛔ FINAL C6 BLOCK: No imperative verb → C1")
-            return self._create_result('C1', 'Remember', 0.88, ml_prediction,
-                                      'final_c6_block_no_imperative', ml_level, ml_confidence)
+            return ('C1', 'Remember', 0.88, 'final_c6_block_no_imperative')
         
-        # ====== STAGE 9: KEEP ML PREDICTION ======
-        return {
-            'category': ml_level,
-            'category_name': ml_prediction.get('category_name', ''),
-            'confidence': ml_confidence,
-            'all_probabilities': ml_prediction.get('all_probabilities', {}),
-            'adjustment_reason': 'ml_kept',
-            'ml_category': ml_level,
-            'ml_confidence': ml_confidence,
-            'was_adjusted': False
-        }
-    
-    def _create_result(self, category, name, confidence, ml_pred, reason, ml_cat, ml_conf):
-        return {
-            'category': category,
-            'category_name': name,
-            'confidence': confidence,
-            'all_probabilities': ml_pred.get('all_probabilities', {}),
-            'adjustment_reason': reason,
-            'ml_category': ml_cat,
-            'ml_confidence': ml_conf,
-            'was_adjusted': category != ml_cat
-        }
+        return (ml_level, None, None, 'ml_kept')
+
+
+IndonesianBloomAdjuster._compile_all()
+
+
+# Global instance - keeps one decision cache for every convenience call
+_adjuster_instance = None
+_adjuster_lock = threading.Lock()
+
+def get_adjuster():
+    """
+    Get or create the global adjuster instance (safe across request threads)
+    """
+    global _adjuster_instance
+    if _adjuster_instance is None:
+        with _adjuster_lock:
+            if _adjuster_instance is None:
+                _adjuster_instance = IndonesianBloomAdjuster()
+    return _adjuster_instance
 
 
 def adjust_classification_with_patterns(question_text, ml_prediction):
     """Convenience function"""
-    adjuster = IndonesianBloomAdjuster()
-    return adjuster.adjust_classification(question_text, ml_prediction)
\ No newline at end of file
+    adjuster = get_adjuster()
+    return adjuster.adjust_classification(question_text, ml_prediction)
+
+
+def adjust_classification_batch_with_patterns(questions, ml_predictions):
+    """Convenience function for a whole list of questions"""
+    adjuster = get_adjuster()
+    return adjuster.adjust_classification_batch(questions, ml_predictions)
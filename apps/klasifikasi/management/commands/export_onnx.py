@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.klasifikasi.ml_model import BloomClassifier
+
+
+class Command(BaseCommand):
+    help = 'Export the Bloom classifier to model.onnx for BLOOM_ONNX'
+
+    def handle(self, *args, **options):
+        # Export the plain FP32 PyTorch model whatever the serving settings say
+        classifier = BloomClassifier(use_pattern_adjusters=False)
+        classifier.quantize = False
+        classifier.use_torchscript = False
+        classifier.use_onnx = False
+        
+        try:
+            onnx_path = classifier.export_onnx()
+        except Exception as e:
+            raise CommandError(f"ONNX export failed: {e}")
+        
+        self.stdout.write(self.style.SUCCESS(f"Exported model to {onnx_path}"))
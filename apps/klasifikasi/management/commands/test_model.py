@@ -1,9 +1,36 @@
-from django.core.management.base import BaseCommand
+import time
+
+from django.core.management.base import BaseCommand, CommandError
 from apps.klasifikasi.ml_model import get_classifier  # Changed this line
 
+# Fixed questions for --benchmark, one per level in each language
+BENCHMARK_QUESTIONS = [
+    "Apa yang dimaksud dengan variabel dalam pemrograman?",
+    "Jelaskan perbedaan antara compiler dan interpreter!",
+    "Hitunglah luas lingkaran dengan jari-jari 7 cm.",
+    "Bandingkan kelebihan dan kekurangan metode waterfall dan agile.",
+    "Evaluasilah efektivitas algoritma sorting yang digunakan pada data tersebut.",
+    "Rancanglah sebuah sistem informasi perpustakaan sederhana.",
+    "What is the definition of an operating system?",
+    "Explain why normalization is important in database design.",
+    "Calculate the average of the following numbers: 4, 8, 15, 16.",
+    "Analyze the relationship between network latency and throughput.",
+    "Evaluate the effectiveness of the proposed security policy.",
+    "Design a class diagram for an online shopping application.",
+]
+
+
 class Command(BaseCommand):
     help = 'Test the Bloom classifier model'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--benchmark', action='store_true',
+                            help='Time predictions over a fixed question set after a warmup')
+        parser.add_argument('--runs', type=int, default=50,
+                            help='Number of timed single predictions for --benchmark')
+        parser.add_argument('--translate', action='store_true',
+                            help='Include Indonesian → English translation in --benchmark timings')
+
     def handle(self, *args, **options):
         classifier = get_classifier()
         
@@ -22,4 +49,44 @@ class Command(BaseCommand):
         # Show all probabilities
         self.stdout.write(self.style.SUCCESS("\nAll Category Probabilities:"))
         for category, data in result['all_probabilities'].items():
-            self.stdout.write(f"  {category:12s}: {data['probability']:.2%}")
\ No newline at end of file
+            self.stdout.write(f"  {category:12s}: {data['probability']:.2%}")
+        
+        if options['benchmark']:
+            if options['runs'] < 1:
+                raise CommandError("--runs must be at least 1")
+            self._benchmark(classifier, options['runs'], options['translate'])
+
+    @staticmethod
+    def _clear_decision_caches(classifier):
+        """Drop the adjusters' cached decisions so every timed call runs the rules"""
+        for adjuster in (classifier.indonesian_adjuster, classifier.english_adjuster):
+            if adjuster is not None:
+                adjuster.clear_decision_cache()
+
+    def _benchmark(self, classifier, runs, translate):
+        """Print single-question latency and batch throughput over BENCHMARK_QUESTIONS"""
+        # The first call pays for lazy setup; keep it out of the timings
+        classifier.predict_single("warmup", translate=translate)
+        
+        # The questions repeat, so without this the adjusters would answer
+        # every run after the first from their decision caches
+        latencies = []
+        for i in range(runs):
+            question = BENCHMARK_QUESTIONS[i % len(BENCHMARK_QUESTIONS)]
+            self._clear_decision_caches(classifier)
+            start = time.perf_counter_ns()
+            classifier.predict_single(question, translate=translate)
+            latencies.append(time.perf_counter_ns() - start)
+        latencies.sort()
+        mean_ms = sum(latencies) / len(latencies) / 1e6
+        p95_ms = latencies[max(0, -(-len(latencies) * 95 // 100) - 1)] / 1e6
+        
+        self._clear_decision_caches(classifier)
+        start = time.perf_counter_ns()
+        classifier.predict_batch(BENCHMARK_QUESTIONS, translate=translate)
+        batch_ms = (time.perf_counter_ns() - start) / 1e6
+        
+        self.stdout.write(self.style.SUCCESS("\nBenchmark (adjuster decision caches cleared before each call):"))
+        self.stdout.write(f"  predict_single: {runs} runs, mean {mean_ms:.1f} ms, p95 {p95_ms:.1f} ms")
+        self.stdout.write(f"  predict_batch : {len(BENCHMARK_QUESTIONS)} questions in {batch_ms:.1f} ms "
+                          f"({batch_ms / len(BENCHMARK_QUESTIONS):.1f} ms/question)")
@@ -11,12 +11,21 @@ from transformers import AutoTokenizer, AutoModelForSequenceClassification
 from torch.nn.functional import sigmoid
 from deep_translator import GoogleTranslator
 import logging
+import os
+import tempfile
 from pathlib import Path
 from django.conf import settings
 import re
 
 logger = logging.getLogger(__name__)
 
+# Optional: ONNX Runtime serves the exported model with fused CPU kernels
+try:
+    import onnxruntime
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
 # Import BOTH pattern adjusters
 try:
     from .indonesian_rules import IndonesianBloomAdjuster
@@ -56,6 +65,10 @@ class BloomClassifier:
     # Classification threshold
     THRESHOLD = 0.5
     
+    # ONNX export of the model, and the weight files it must be newer than
+    ONNX_FILENAME = 'model.onnx'
+    WEIGHT_FILE_PATTERNS = ('*.safetensors', 'pytorch_model*.bin')
+    
     def __init__(self, model_path=None, use_pattern_adjusters=True):
         """
         Initialize the classifier
@@ -65,8 +78,14 @@ class BloomClassifier:
             use_pattern_adjusters: Whether to use pattern-based adjustment
         """
         self.model_path = model_path or getattr(settings, 'BLOOM_MODEL_PATH', './roberta_multilabel')
+        self.quantize = getattr(settings, 'BLOOM_QUANTIZE', False)
+        self.is_quantized = False
+        self.use_torchscript = getattr(settings, 'BLOOM_TORCHSCRIPT', False)
+        self.use_onnx = getattr(settings, 'BLOOM_ONNX', False)
         self.tokenizer = None
         self.model = None
+        self.traced_model = None
+        self.onnx_session = None
         self.translator = GoogleTranslator(source='id', target='en')
         self.is_loaded = False
         
@@ -110,6 +129,19 @@ class BloomClassifier:
             # Set to evaluation mode
             self.model.eval()
             
+            # Optional ONNX Runtime session for the forward pass
+            if self.use_onnx:
+                self._load_onnx_session()
+            
+            if self.onnx_session is None:
+                # Optional INT8 weights for the Linear layers on CPU
+                if self.quantize:
+                    self._quantize_model()
+                
+                # Optional frozen TorchScript trace for the forward pass
+                if self.use_torchscript:
+                    self._trace_model()
+            
             self.is_loaded = True
             logger.info("✓ Model loaded successfully")
             return True
@@ -119,6 +151,211 @@ class BloomClassifier:
             self.is_loaded = False
             return False
     
+    def _quantize_model(self):
+        """
+        Dynamically quantize the model's Linear layers to INT8
+        
+        Weights are stored as INT8 and activations are scaled on the fly,
+        so no calibration data is needed. Falls back to FP32 when no
+        quantized engine is available.
+        """
+        engines = torch.backends.quantized.supported_engines
+        # fbgemm on x86, qnnpack on ARM
+        engine = next((e for e in ('fbgemm', 'x86', 'qnnpack') if e in engines), None)
+        if engine is None:
+            logger.warning("No quantized engine available, keeping FP32 model")
+            return
+        
+        try:
+            torch.backends.quantized.engine = engine
+            self.model = torch.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+            self.is_quantized = True
+            logger.info("✓ Model quantized to INT8 (%s)", engine)
+        except Exception as e:
+            logger.warning("Quantization failed, keeping FP32 model: %s", e)
+    
+    def _trace_model(self):
+        """
+        Trace and freeze the model with TorchScript for inference
+        
+        Batches are padded to their own longest question, so the trace is
+        checked against the eager model on an input of another length.
+        Any tracing error or mismatch keeps the eager model.
+        """
+        example = self.tokenizer("Apa yang dimaksud dengan variabel?", return_tensors="pt")
+        check = self.tokenizer(
+            ["Explain why normalization is important in database design.", "Define a variable."],
+            return_tensors="pt",
+            padding=True
+        )
+        
+        # Tracing needs plain tuple outputs
+        return_dict = self.model.config.return_dict
+        self.model.config.return_dict = False
+        try:
+            with torch.no_grad():
+                traced = torch.jit.trace(self.model, (example['input_ids'], example['attention_mask']))
+                traced = torch.jit.optimize_for_inference(torch.jit.freeze(traced))
+                
+                # The first calls also run the JIT's profiling and fusion passes
+                for _ in range(2):
+                    traced_logits = traced(check['input_ids'], check['attention_mask'])[0]
+                eager_logits = self.model(check['input_ids'], attention_mask=check['attention_mask'])[0]
+        except Exception as e:
+            logger.warning("TorchScript tracing failed, using eager model: %s", e)
+            return
+        finally:
+            self.model.config.return_dict = return_dict
+        
+        if not torch.allclose(traced_logits, eager_logits, atol=1e-4):
+            logger.warning("TorchScript trace does not match the eager model, using eager model")
+            return
+        
+        self.traced_model = traced
+        logger.info("✓ Model traced with TorchScript")
+    
+    def _onnx_path(self):
+        """Where export_onnx writes the model and BLOOM_ONNX reads it"""
+        return Path(self.model_path) / self.ONNX_FILENAME
+    
+    def _onnx_is_stale(self, onnx_path):
+        """True if any weight file in the model directory is newer than onnx_path"""
+        onnx_mtime = onnx_path.stat().st_mtime
+        model_dir = Path(self.model_path)
+        return any(
+            weights.stat().st_mtime > onnx_mtime
+            for pattern in self.WEIGHT_FILE_PATTERNS
+            for weights in model_dir.glob(pattern)
+        )
+    
+    def _load_onnx_session(self):
+        """
+        Serve the model through ONNX Runtime
+        
+        Only opens an existing model.onnx (written by the export_onnx
+        management command) that is newer than every weight file. A
+        missing or stale export, any error or a mismatch with the eager
+        model keeps the PyTorch model.
+        """
+        if not ONNXRUNTIME_AVAILABLE:
+            logger.warning("onnxruntime not installed, using PyTorch model")
+            return
+        
+        onnx_path = self._onnx_path()
+        if not onnx_path.exists():
+            logger.warning("%s not found (run manage.py export_onnx), using PyTorch model", onnx_path)
+            return
+        if self._onnx_is_stale(onnx_path):
+            logger.warning("%s is older than the model weights (run manage.py export_onnx), "
+                           "using PyTorch model", onnx_path)
+            return
+        
+        try:
+            session = self._open_onnx_session(onnx_path)
+        except Exception as e:
+            logger.warning("ONNX Runtime setup failed, using PyTorch model: %s", e)
+            return
+        
+        self.onnx_session = session
+        logger.info("✓ Model served with ONNX Runtime")
+    
+    def _open_onnx_session(self, onnx_path):
+        """ONNX Runtime session for onnx_path, checked against the eager model"""
+        check = self.tokenizer(
+            ["Explain why normalization is important in database design.", "Define a variable."],
+            return_tensors="pt",
+            padding=True
+        )
+        
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session = onnxruntime.InferenceSession(
+            str(onnx_path), sess_options=options, providers=['CPUExecutionProvider']
+        )
+        
+        onnx_logits = session.run(['logits'], {
+            'input_ids': check['input_ids'].numpy(),
+            'attention_mask': check['attention_mask'].numpy(),
+        })[0]
+        with torch.no_grad():
+            eager_logits = self.model(**check).logits
+        
+        if not torch.allclose(torch.from_numpy(onnx_logits), eager_logits, atol=1e-4):
+            raise ValueError("ONNX model does not match the PyTorch model")
+        return session
+    
+    def export_onnx(self):
+        """
+        Export the model to model.onnx next to its weights
+        
+        The export goes to a temporary file in the same directory and only
+        replaces model.onnx once ONNX Runtime reproduces the eager logits,
+        so a failed export never leaves a partial or broken model.onnx.
+        Returns the path written.
+        """
+        if not ONNXRUNTIME_AVAILABLE:
+            raise RuntimeError("onnxruntime not installed")
+        if not self.load_model():
+            raise RuntimeError(f"Model could not be loaded from {self.model_path}")
+        if self.is_quantized:
+            raise RuntimeError("ONNX export needs the FP32 model, turn off BLOOM_QUANTIZE")
+        
+        onnx_path = self._onnx_path()
+        fd, tmp_path = tempfile.mkstemp(dir=onnx_path.parent, prefix='.model-', suffix='.onnx')
+        os.close(fd)
+        try:
+            self._export_onnx(tmp_path)
+            self._open_onnx_session(tmp_path)
+            # mkstemp creates the file private to this user
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, onnx_path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        
+        logger.info("✓ Model exported to %s", onnx_path)
+        return onnx_path
+    
+    def _export_onnx(self, onnx_path):
+        """Export the model to ONNX with dynamic batch and sequence axes"""
+        logger.info("Exporting model to %s", onnx_path)
+        example = self.tokenizer("Apa yang dimaksud dengan variabel?", return_tensors="pt")
+        
+        # Export needs plain tuple outputs
+        return_dict = self.model.config.return_dict
+        self.model.config.return_dict = False
+        try:
+            with torch.no_grad():
+                torch.onnx.export(
+                    self.model,
+                    (example['input_ids'], example['attention_mask']),
+                    str(onnx_path),
+                    input_names=['input_ids', 'attention_mask'],
+                    output_names=['logits'],
+                    dynamic_axes={
+                        'input_ids': {0: 'batch', 1: 'sequence'},
+                        'attention_mask': {0: 'batch', 1: 'sequence'},
+                        'logits': {0: 'batch'},
+                    },
+                    opset_version=17
+                )
+        finally:
+            self.model.config.return_dict = return_dict
+    
+    def _logits(self, inputs):
+        """Forward pass on tokenized inputs, through ONNX Runtime or the trace when set up"""
+        if self.onnx_session is not None:
+            logits = self.onnx_session.run(['logits'], {
+                'input_ids': inputs['input_ids'].numpy(),
+                'attention_mask': inputs['attention_mask'].numpy(),
+            })[0]
+            return torch.from_numpy(logits)
+        if self.traced_model is not None:
+            return self.traced_model(inputs['input_ids'], inputs['attention_mask'])[0]
+        return self.model(**inputs).logits
+    
     def _detect_language(self, text):
         """
         Detect if text is Indonesian or English
@@ -144,16 +381,17 @@ class BloomClassifier:
             'analyze', 'evaluate', 'create', 'does', 'do'
         ]
         
-        # Count matches
-        indonesian_count = sum(1 for word in indonesian_words if f' {word} ' in f' {text_lower} ' or text_lower.startswith(f'{word} '))
-        english_count = sum(1 for word in english_words if f' {word} ' in f' {text_lower} ' or text_lower.startswith(f'{word} '))
+        # Count matches (padding once also covers a word at the very start)
+        padded = f' {text_lower} '
+        indonesian_count = sum(1 for word in indonesian_words if f' {word} ' in padded)
+        english_count = sum(1 for word in english_words if f' {word} ' in padded)
         
         # Decision
         if indonesian_count > english_count:
-            logger.debug(f"Language: Indonesian (ID:{indonesian_count} vs EN:{english_count})")
+            logger.debug("Language: Indonesian (ID:%d vs EN:%d)", indonesian_count, english_count)
             return 'id'
         elif english_count > indonesian_count:
-            logger.debug(f"Language: English (EN:{english_count} vs ID:{indonesian_count})")
+            logger.debug("Language: English (EN:%d vs ID:%d)", english_count, indonesian_count)
             return 'en'
         else:
             # Fallback: Indonesian often has repeated vowels
@@ -171,10 +409,10 @@ class BloomClassifier:
                 self.translator = GoogleTranslator(source=src, target=dest)
             
             translated = self.translator.translate(text)
-            logger.debug(f"Translated: '{text[:50]}...' -> '{translated[:50]}...'")
+            logger.debug("Translated: '%.50s...' -> '%.50s...'", text, translated)
             return translated
         except Exception as e:
-            logger.warning(f"Translation failed: {e}. Using original text.")
+            logger.warning("Translation failed: %s. Using original text.", e)
             return text
     
     def _apply_consistency_rules(self, predictions, confidence, detected_lang):
@@ -192,24 +430,24 @@ class BloomClassifier:
         # Rule 1: Very low confidence - let patterns decide
         if confidence < 0.55:
             predictions['uncertain'] = True
-            logger.debug(f"Low ML confidence ({confidence:.2f}), patterns may override")
+            logger.debug("Low ML confidence (%.2f), patterns may override", confidence)
             return predictions
         
         # Rule 2: C1/C2 with medium+ confidence - boost slightly
         if category in ['C1', 'C2'] and confidence > 0.65:
             boosted = min(0.95, confidence + 0.08)
-            logger.debug(f"Boosted {category}: {confidence:.2f} -> {boosted:.2f} (easier to detect)")
+            logger.debug("Boosted %s: %.2f -> %.2f (easier to detect)", category, confidence, boosted)
             predictions['confidence'] = boosted
             predictions['confidence_boosted'] = True
         
         # Rule 3: High levels (C5/C6) need high confidence
         if category in ['C5', 'C6'] and confidence < 0.70:
-            logger.debug(f"{category} with low confidence ({confidence:.2f}), marked uncertain")
+            logger.debug("%s with low confidence (%.2f), marked uncertain", category, confidence)
             predictions['uncertain'] = True
         
         # Rule 4: C4 is often over-predicted, be cautious
         if category == 'C4' and confidence < 0.75:
-            logger.debug(f"C4 with medium confidence, patterns may adjust")
+            logger.debug("C4 with medium confidence, patterns may adjust")
             predictions['uncertain'] = True
         
         return predictions
@@ -230,7 +468,7 @@ class BloomClassifier:
             
             # Detect language BEFORE translation
             detected_lang = self._detect_language(original_text)
-            logger.debug(f"Detected language: {detected_lang.upper()}")
+            logger.debug("Detected language: %s", detected_lang.upper())
             
             # Translate if needed
             if translate and detected_lang == 'id':
@@ -247,8 +485,7 @@ class BloomClassifier:
             
             # Predict
             with torch.no_grad():
-                outputs = self.model(**inputs)
-                probs = sigmoid(outputs.logits).numpy()[0]
+                probs = sigmoid(self._logits(inputs)).numpy()[0]
             
             # Build results dictionary
             all_probs = {}
@@ -360,7 +597,7 @@ class BloomClassifier:
                             translated = self.translate_text(text, src="id", dest="en")
                             translated_texts.append(translated)
                         except Exception as e:
-                            logger.warning(f"Translation failed, using original: {e}")
+                            logger.warning("Translation failed, using original: %s", e)
                             translated_texts.append(text)
                     else:
                         translated_texts.append(text)
@@ -384,8 +621,7 @@ class BloomClassifier:
                 
                 # Predict
                 with torch.no_grad():
-                    outputs = self.model(**inputs)
-                    probs_batch = sigmoid(outputs.logits).numpy()
+                    probs_batch = sigmoid(self._logits(inputs)).numpy()
                 
                 # Process each prediction in batch
                 for j, (probs, original, lang) in enumerate(zip(probs_batch, batch_originals, batch_languages)):
@@ -494,6 +730,9 @@ class BloomClassifier:
             "labels": self.LABEL_COLUMNS,
             "threshold": self.THRESHOLD,
             "model_type": "RoBERTa",
+            "quantized": self.is_quantized,
+            "torchscript": self.traced_model is not None,
+            "onnx": self.onnx_session is not None,
             "max_length": 512,
             "adjusters": {
                 "indonesian": self.indonesian_adjuster is not None,
@@ -1,3 +1,789 @@
-from django.test import TestCase
+import os
+import random
+import re
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, override_settings
+
+from apps.klasifikasi import english_rules, indonesian_rules
+
+# Optional: the ONNX tests need the whole ML stack
+try:
+    import torch
+    import transformers
+    from apps.klasifikasi import ml_model
+    ONNX_STACK_AVAILABLE = ml_model.ONNXRUNTIME_AVAILABLE
+except ImportError:
+    ONNX_STACK_AVAILABLE = False
+
+
+def _prediction(category, confidence):
+    return {'category': category, 'category_name': '', 'confidence': confidence, 'all_probabilities': {}}
+
+
+PREDICTIONS = tuple(
+    _prediction(category, confidence)
+    for category in ('C1', 'C2', 'C3', 'C4', 'C5', 'C6')
+    for confidence in (0.5, 0.9)
+)
+
+
+# Every pattern list, the adjuster's group over it, and the flags the
+# original per-pattern re.search used
+PATTERN_LISTS = (
+    ('ABSOLUTE_C1_BLOCKERS', 'absolute_c1', re.IGNORECASE),
+    ('FORCE_C1_PATTERNS', 'force_c1', re.IGNORECASE),
+    ('FORCE_C2_PATTERNS', 'force_c2', re.IGNORECASE),
+    ('FORCE_C3_PATTERNS', 'force_c3', re.IGNORECASE),
+    ('FORCE_C4_PATTERNS', 'force_c4', re.IGNORECASE),
+    ('FORCE_C5_PATTERNS', 'force_c5', re.IGNORECASE),
+    ('FORCE_C6_PATTERNS', 'force_c6', re.IGNORECASE),
+    ('BLOCK_C5_C6_IF_ASKING_ABOUT', 'block_c5_c6', re.IGNORECASE),
+    ('BLOCK_C6_DESCRIPTIVE', 'block_c6_desc', re.IGNORECASE),
+    ('PASSIVE_FACT_PATTERNS', 'passive_fact', re.IGNORECASE),
+    ('PROHIBITION_RULE_PATTERNS', 'prohibition', re.IGNORECASE),
+    ('ARTICLE_CITATION_RECALL', 'article_citation', re.IGNORECASE),
+    ('WHO_WHAT_WHERE_MARKERS', 'who_what_where', re.IGNORECASE),
+    ('BLOCK_C3_ARTICLE_RECALL', 'block_c3', re.IGNORECASE),
+    ('DECLARATIVE_PATTERNS', 'declarative', 0),
+)
+
+QUESTIONS = (
+    "apa yang disebut dengan sistem operasi?",
+    "bagian otak yang mengatur keseimbangan disebut?",
+    "pengertian dari algoritma adalah",
+    "apa yang dimaksud dengan variabel dalam pemrograman?",
+    "jelaskan mengapa normalisasi penting dalam basis data!",
+    "jelaskan bagaimana cara kerja compiler",
+    "terapkan rumus pythagoras untuk segitiga berikut",
+    "gunakan metode eliminasi untuk menyelesaikan sistem persamaan ini",
+    "hitunglah luas lingkaran dengan jari-jari 7 cm.",
+    "selesaikanlah soal cerita berikut",
+    "analisislah faktor penyebab inflasi di indonesia",
+    "identifikasi masalah utama pada studi kasus tersebut",
+    "klasifikasikan hewan berikut berdasarkan jenis makanannya",
+    "evaluasilah efektivitas algoritma sorting yang digunakan.",
+    "nilailah kelayakan proyek tersebut",
+    "apa yang paling efektif untuk mengurangi kemacetan?",
+    "rancanglah sebuah sistem informasi perpustakaan sederhana.",
+    "susunlah strategi pemasaran untuk produk baru",
+    "ciptakan sebuah lagu tentang lingkungan",
+    "desainlah suatu antarmuka aplikasi mobile",
+    "bandingkan dan kontraskan kedua metode tersebut",
+    "penilaian dilakukan melalui kriteria yang telah ditentukan",
+    "kriteria yang digunakan untuk evaluasi program adalah",
+    "sistem yang mengintegrasikan perangkat keras dan perangkat lunak disebut",
+    "kumpulan data yang tersimpan secara terstruktur adalah",
+    "teori evolusi dikemukakan oleh",
+    "teori relativitas diperkenalkan oleh siapa?",
+    "pegawai negeri dilarang untuk melakukan kegiatan politik praktis",
+    "peserta harus memenuhi syarat berikut, kecuali :",
+    "menurut pasal 1320 kuh perdata, syarat sahnya perjanjian adalah",
+    "sebagaimana diatur dalam pasal 5, hak pekerja meliputi",
+    "pasal 28 menyatakan bahwa setiap orang berhak",
+    "siapa yang menemukan mesin uap?",
+    "di mana letak candi borobudur?",
+    "undang-undang ketenagakerjaan mengatur tentang",
+    "menurut para ahli, pengertian manajemen adalah",
+    "hewan yang termasuk dalam kategori mamalia adalah",
+    "ibu kota indonesia adalah ...",
+    "proses fotosintesis disebut apa ?",
+    "what is an operating system?",
+    "di",
+    "",
+)
+
+
+def _corpus():
+    """QUESTIONS plus variants with other endings, whitespace and casefold letters"""
+    texts = []
+    for question in QUESTIONS:
+        texts.extend([
+            question,
+            question + '?',
+            question + ' .',
+            question + '  \n',
+            question + '\n',
+            question + ' ?\n',
+            '\x0b'.join(question.split(' ')),
+            '\t'.join(question.split(' ')),
+            question.replace('s', 'ſ'),
+            question.replace('i', 'ı'),
+        ])
+    return texts
+
+
+def _reference_count(patterns, flags, text, limit):
+    """What one plain re.search per pattern gives"""
+    return min(sum(1 for p in patterns if re.search(p, text, flags)), limit)
+
+
+def _build_groups(hyperscan=False, re2=False, ahocorasick=False):
+    """Fresh groups over every pattern list with only the given backends enabled"""
+    adjuster_cls = indonesian_rules.IndonesianBloomAdjuster
+    with mock.patch.multiple(indonesian_rules, HYPERSCAN_AVAILABLE=hyperscan, RE2_AVAILABLE=re2,
+                             AHOCORASICK_AVAILABLE=ahocorasick):
+        return [
+            (getattr(adjuster_cls, name), flags,
+             indonesian_rules.PatternGroup(getattr(adjuster_cls, name), casefold=bool(flags)))
+            for name, _, flags in PATTERN_LISTS
+        ]
+
+
+class ImperativeVerbTests(SimpleTestCase):
+    def setUp(self):
+        self.adjuster = indonesian_rules.IndonesianBloomAdjuster()
+
+    def test_lah_particle(self):
+        for question in ('susunlah strategi pemasaran', 'terapkanlah rumus tersebut',
+                         'selesaikanlah soal berikut', 'gunakanlah metode eliminasi',
+                         'jelaskanlah maksud teks', 'tentukanlah nilai x'):
+            with self.subTest(question=question):
+                self.assertTrue(self.adjuster._has_imperative_verb(question))
+
+    def test_whole_word_only(self):
+        for question in ('metode yang digunakan adalah', 'penilaian akhir semester'):
+            with self.subTest(question=question):
+                self.assertFalse(self.adjuster._has_imperative_verb(question))
+
+    def test_lah_form_reaches_force_c6(self):
+        result = self.adjuster.adjust_classification("Susunlah strategi pemasaran untuk produk baru",
+                                                     _prediction('C6', 0.9))
+        self.assertEqual(result['category'], 'C6')
+        self.assertEqual(result['adjustment_reason'], 'force_c6_pattern')
+
+    def test_lah_form_is_not_downgraded(self):
+        result = self.adjuster.adjust_classification("Selesaikanlah soal cerita berikut", _prediction('C3', 0.6))
+        self.assertEqual(result['category'], 'C3')
+        self.assertNotEqual(result['adjustment_reason'], 'downgrade_uncertain')
+
+
+# One question per adjustment reason: (question, ML level, ML confidence,
+# reason, the line the original stage logged)
+DECISION_LOG_CASES = (
+    ("Apa yang disebut dengan sistem operasi?", 'C1', 0.9,
+     'absolute_c1_blocker', "🔒 ABSOLUTE C1 BLOCK: C1(0.90) → C1(0.96)"),
+    ("Manakah yang benar, kecuali", 'C2', 0.9,
+     'kecuali_question', "🔒 KECUALI QUESTION: C2(0.90) → C1(0.97)"),
+    ("Teori evolusi dikemukakan oleh Darwin pada abad ke-19", 'C6', 0.8,
+     'passive_fact_to_c1', "⛔ PASSIVE FACT→C1: C6(0.80) → C1"),
+    ("Siapa yang menemukan mesin uap?", 'C4', 0.8,
+     'who_what_where_to_c1', "⛔ WHO/WHAT/WHERE→C1: C4(0.80) → C1"),
+    ("Pegawai negeri dilarang untuk melakukan kegiatan politik praktis", 'C5', 0.8,
+     'prohibition_context_to_c1', "⛔ PROHIBITION CONTEXT→C1: C5(0.80) → C1"),
+    ("Menurut pasal 1320 KUH Perdata, syarat sahnya perjanjian meliputi", 'C3', 0.8,
+     'article_citation_to_c1', "⛔ ARTICLE CITATION→C1: C3(0.80) → C1"),
+    ("Undang-undang ketenagakerjaan mengatur tentang hak pekerja", 'C3', 0.8,
+     'block_c3_article_recall', "⛔ BLOCK C3→C1: Article recall pattern"),
+    ("Kumpulan data yang tersimpan secara terstruktur", 'C6', 0.8,
+     'block_false_c6_descriptive', "⛔ BLOCK C6→C1: False C6 (descriptive definition)"),
+    ("Penilaian dilakukan melalui kriteria tertentu", 'C5', 0.8,
+     'block_c5_c6_criteria', "⛔ BLOCK C5/C6→C1: Asking about criteria/basis"),
+    ("Hasil akhir perhitungan ini merupakan nilai rata rata", 'C5', 0.8,
+     'declarative_downgrade', "⛔ DECLARATIVE→C1: C5 → C1 (declarative form)"),
+    ("Apa yang dimaksud dengan variabel dalam pemrograman?", 'C2', 0.6,
+     'force_c1_pattern', "✓ FORCE C1: C2(0.60) → C1(0.95)"),
+    ("Jelaskan mengapa normalisasi penting dalam basis data!", 'C1', 0.6,
+     'force_c2_pattern', "✓ FORCE C2: C1(0.60) → C2(0.92)"),
+    ("Hitunglah luas lingkaran berikut", 'C2', 0.6,
+     'force_c3_pattern', "✓ FORCE C3: C2(0.60) → C3(0.87)"),
+    ("Analisislah faktor penyebab inflasi di Indonesia", 'C2', 0.6,
+     'force_c4_pattern', "✓ FORCE C4: C2(0.60) → C4(0.89)"),
+    ("Evaluasilah efektivitas algoritma sorting tersebut", 'C2', 0.6,
+     'force_c5_pattern', "✓ FORCE C5: C2(0.60) → C5(0.91)"),
+    ("Rancanglah sebuah sistem informasi perpustakaan sederhana", 'C2', 0.6,
+     'force_c6_pattern', "✓ FORCE C6: C2(0.60) → C6(0.93)"),
+    ("Bagaimana pendapatmu tentang ekosistem laut", 'C4', 0.5,
+     'downgrade_uncertain', "⬇️ DOWNGRADE: C4(0.50) → C2"),
+    ("Bagaimana pendapatmu tentang ekosistem laut", 'C6', 0.9,
+     'final_c6_block_no_imperative', "⛔ FINAL C6 BLOCK: No imperative verb → C1"),
+)
+
+
+class DecisionLoggingTests(SimpleTestCase):
+    def setUp(self):
+        self.adjuster = indonesian_rules.IndonesianBloomAdjuster()
+
+    def test_every_reason_is_covered(self):
+        self.assertEqual({case[3] for case in DECISION_LOG_CASES},
+                         set(indonesian_rules.IndonesianBloomAdjuster.DECISION_LOGS))
+
+    def test_logged_on_every_call(self):
+        for question, category, confidence, reason, message in DECISION_LOG_CASES:
+            with self.subTest(reason=reason):
+                with self.assertLogs(indonesian_rules.logger, 'INFO') as logs:
+                    for _ in range(2):
+                        result = self.adjuster.adjust_classification(question, _prediction(category, confidence))
+                self.assertEqual(result['adjustment_reason'], reason)
+                # The second call is a decision cache hit and must log the same
+                self.assertEqual([record.getMessage() for record in logs.records], [message, message])
+
+    def test_force_pattern_keeping_ml_level_is_not_logged(self):
+        for level, question in (('C1', "Apa yang dimaksud dengan variabel dalam pemrograman?"),
+                                ('C3', "Hitunglah luas lingkaran berikut"),
+                                ('C6', "Rancanglah sebuah sistem informasi perpustakaan sederhana")):
+            with self.subTest(level=level):
+                with self.assertNoLogs(indonesian_rules.logger, 'INFO'):
+                    result = self.adjuster.adjust_classification(question, _prediction(level, 0.9))
+                self.assertEqual(result['adjustment_reason'], 'force_%s_pattern' % level.lower())
+
+    def test_ml_kept_is_not_logged(self):
+        with self.assertNoLogs(indonesian_rules.logger, 'INFO'):
+            result = self.adjuster.adjust_classification("Bagaimana pendapatmu tentang ekosistem laut",
+                                                         _prediction('C2', 0.9))
+        self.assertEqual(result['adjustment_reason'], 'ml_kept')
+
+
+# English counterpart of DECISION_LOG_CASES
+ENGLISH_DECISION_LOG_CASES = (
+    ("Who proposed the theory of relativity?", 'C6', 0.8,
+     'historical_creator_blocker', "🔒 HISTORICAL CREATOR BLOCK: C6(0.80) → C1(0.96)"),
+    ("What does TCP stand for?", 'C3', 0.8,
+     'acronym_blocker', "🔒 ACRONYM BLOCK: C3(0.80) → C1(0.97)"),
+    ("Normalization is defined as a process", 'C2', 0.8,
+     'definition_recall_blocker', "🔒 DEFINITION RECALL BLOCK: C2(0.80) → C1(0.95)"),
+    ("What causes SQL poisoning attack to succeed?", 'C4', 0.8,
+     'technical_term_blocker', "🔒 TECHNICAL TERM BLOCK: C4(0.80) → C2(0.95)"),
+    ("The CPU is called the?", 'C1', 0.8,
+     'absolute_c1_blocker', "🔒 ABSOLUTE C1 BLOCK: C1(0.80) → C1(0.96)"),
+    ("A system that integrates hardware and software", 'C6', 0.8,
+     'block_false_c6_descriptive', "⛔ BLOCK C6→C1: False C6 (descriptive definition)"),
+    ("Which criteria are used to judge the design", 'C5', 0.8,
+     'block_c5_c6_criteria', "⛔ BLOCK C5/C6→C1: Asking about criteria/basis"),
+    ("What happens if the server crashes", 'C4', 0.8,
+     'block_false_c4', "⛔ BLOCK FALSE C4→C2: C4(0.80) → C2"),
+    ("Devise a plan to reduce network latency", 'C2', 0.6,
+     'Detected strong Create pattern (Rule-based override)', "✓ ADJUSTED: C2 → C6 | Reason: Strong Pattern"),
+    ("Evaluate the effectiveness of the algorithm", 'C2', 0.6,
+     'Detected strong Evaluate pattern (Rule-based override)', "✓ ADJUSTED: C2 → C5 | Reason: Strong Pattern"),
+    ("Analyze the differences between TCP and UDP", 'C2', 0.6,
+     'Detected strong Analyze pattern (Rule-based override)', "✓ ADJUSTED: C2 → C4 | Reason: Strong Pattern"),
+    ("Calculate the area of the circle", 'C2', 0.6,
+     'Detected strong Apply pattern (Rule-based override)', "✓ ADJUSTED: C2 → C3 | Reason: Strong Pattern"),
+    ("Explain why the sky is blue", 'C1', 0.6,
+     'Detected strong Understand pattern (Rule-based override)', "✓ ADJUSTED: C1 → C2 | Reason: Strong Pattern"),
+    ("List the layers of the OSI model", 'C2', 0.6,
+     'Detected strong Remember pattern (Rule-based override)', "✓ ADJUSTED: C2 → C1 | Reason: Strong Pattern"),
+)
+
+
+class EnglishDecisionLoggingTests(SimpleTestCase):
+    def setUp(self):
+        self.adjuster = english_rules.EnglishBloomAdjuster()
+
+    def test_every_reason_is_covered(self):
+        self.assertEqual({case[3] for case in ENGLISH_DECISION_LOG_CASES},
+                         set(english_rules.EnglishBloomAdjuster.DECISION_LOGS))
+
+    def test_logged_on_every_call(self):
+        for question, category, confidence, reason, message in ENGLISH_DECISION_LOG_CASES:
+            with self.subTest(reason=reason):
+                with self.assertLogs(english_rules.logger, 'INFO') as logs:
+                    for _ in range(2):
+                        result = self.adjuster.adjust_classification(question, _prediction(category, confidence))
+                self.assertEqual(result['adjustment_reason'], reason)
+                # The second call is a decision cache hit and must log the same
+                self.assertEqual([record.getMessage() for record in logs.records], [message, message])
+
+    def test_block_false_c4_syntax_target(self):
+        with self.assertLogs(english_rules.logger, 'INFO') as logs:
+            self.adjuster.adjust_classification("Which command is correct to list files", _prediction('C4', 0.8))
+        self.assertEqual([record.getMessage() for record in logs.records], ["⛔ BLOCK FALSE C4→C1: C4(0.80) → C1"])
+
+    def test_strong_pattern_keeping_ml_level_is_not_logged(self):
+        with self.assertNoLogs(english_rules.logger, 'INFO'):
+            result = self.adjuster.adjust_classification("Evaluate the effectiveness of the algorithm",
+                                                         _prediction('C5', 0.6))
+        self.assertEqual(result['adjustment_reason'], 'Detected strong Evaluate pattern (Rule-based override)')
+
+    def test_keyword_confirmation_is_not_logged(self):
+        with self.assertNoLogs(english_rules.logger, 'INFO'):
+            result = self.adjuster.adjust_classification("Design a new database schema for a library",
+                                                         _prediction('C6', 0.6))
+        self.assertEqual(result['adjustment_reason'], 'ML prediction confirmed by Create keywords')
+
+
+ENGLISH_QUESTIONS = tuple(case[0] for case in ENGLISH_DECISION_LOG_CASES) + (
+    "What is DBMS?",
+    "SQL stands for structured query language",
+    "Who is the father of computer science?",
+    "What does RAM mean?",
+    "Which of the following statement is correct?",
+    "What is the auditor's opinion based on?",
+    "ARP poisoning is a type of attack",
+    "The basic software that manages hardware is",
+    "Compare and contrast TCP and UDP",
+    "Justify your choice of database engine",
+    "Implement a stack using arrays",
+    "Recommend the best approach for caching",
+    "Differentiate between a process and a thread",
+    "Create a data model for the online shop",
+    "Describe the process of photosynthesis",
+    "Kernel mode is known as",
+)
+
+
+def _english_corpus():
+    """ENGLISH_QUESTIONS plus variants with the letters and separators that pick a fallback"""
+    texts = []
+    for question in ENGLISH_QUESTIONS:
+        texts.extend([
+            question,
+            question.upper(),
+            question.replace('i', 'ı'),
+            question.replace('s', 'ſ'),
+            question.replace('I', 'İ').replace('i', 'İ'),
+            question.replace('k', '\u212a').replace('K', '\u212a'),
+            question + ' café',
+            '\xa0'.join(question.split(' ')),
+        ])
+        texts.extend(separator.join(question.split(' ')) for separator in '\x1c\x1d\x1e\x1f')
+    return texts
+
+
+class EnglishFlagsTests(SimpleTestCase):
+    def setUp(self):
+        self.adjuster = english_rules.EnglishBloomAdjuster()
+
+    def assertSameAsIgnoreCase(self, adjuster, text):
+        """Every list of adjuster against the original per-pattern IGNORECASE search"""
+        for name, list_name in adjuster.PATTERN_LISTS:
+            patterns = getattr(adjuster, list_name)
+            expected = [p for p in patterns if re.search(p, text, re.IGNORECASE)]
+            self.assertEqual(getattr(adjuster, 'any_' + name).search(text) is not None, bool(expected),
+                             (list_name, text))
+            if name in adjuster.COUNTED_LISTS:
+                self.assertEqual([c.pattern for c in getattr(adjuster, 'compiled_' + name) if c.search(text)],
+                                 expected, (list_name, text))
+
+    def test_dispatch(self):
+        for question, flags in (("What is DBMS?", re.ASCII),
+                                ("What is DBMS\u212a?", re.ASCII),
+                                ("What ıs DBMS?", re.IGNORECASE),
+                                ("What is DBMſ?", re.IGNORECASE),
+                                ("What İs DBMS?", re.UNICODE),
+                                ("What is DBMS café?", re.UNICODE),
+                                ("What\x1cis DBMS?", re.UNICODE),
+                                ("What\x1fis DBMS?", re.UNICODE)):
+            with self.subTest(question=question):
+                self.assertEqual(self.adjuster._adjuster_for(question.lower().strip()).flags, flags)
+        self.assertEqual(set(self.adjuster._fallback_adjusters), {re.IGNORECASE, re.UNICODE})
+
+    def test_dispatched_instance_matches_ignorecase(self):
+        seen = set()
+        for question in _english_corpus():
+            text = question.lower().strip()
+            adjuster = self.adjuster._adjuster_for(text)
+            seen.add(adjuster.flags)
+            self.assertSameAsIgnoreCase(adjuster, text)
+        self.assertEqual(seen, {re.ASCII, re.IGNORECASE, re.UNICODE})
+
+    def test_ignorecase_instance_matches_ignorecase(self):
+        adjuster = english_rules.EnglishBloomAdjuster(flags=re.IGNORECASE)
+        for question in _english_corpus():
+            self.assertSameAsIgnoreCase(adjuster, question.lower().strip())
+
+    def test_adjustment_matches_ignorecase_instance(self):
+        reference = english_rules.EnglishBloomAdjuster(flags=re.IGNORECASE)
+        for question in _english_corpus():
+            for prediction in PREDICTIONS:
+                self.assertEqual(self.adjuster.adjust_classification(question, dict(prediction)),
+                                 reference.adjust_classification(question, dict(prediction)), question)
+
+
+# The acronym patterns as first written, for IGNORECASE on lowercased text;
+# ACRONYM_PATTERNS spells [A-Z] as [a-z] in the same order
+ORIGINAL_ACRONYM_PATTERNS = (
+    r'\bstands\s+for\b',
+    r'\bwhat\s+does\s+[A-Z]{2,}\s+stand\s+for\b',
+    r'\b[A-Z]{2,}\s+stands\s+for\b',
+    r'\bwhat\s+is\s+[A-Z]{2,}\s*\??$',
+    r'\b[A-Z]{2,}\s+(?:is\s+)?(?:an?\s+)?acronym\s+for\b',
+    r'\bexpand\s+(?:the\s+)?(?:acronym\s+)?[A-Z]{2,}\b',
+    r'\bfull\s+form\s+of\s+[A-Z]{2,}\b',
+    r'\b[A-Z]{2,}\s+(?:is\s+)?short\s+for\b',
+)
+
+ACRONYM_QUESTIONS = (
+    "What does TCP stand for?",
+    "What does TcP stand for?",
+    "what does tcp stand for",
+    "HTTP stands for",
+    "HtTp stands for",
+    "What is DBMS?",
+    "What is DbMs ?",
+    "What is X?",
+    "SQL is an acronym for",
+    "sQl acronym for",
+    "Expand the acronym ReST",
+    "Full form of CPU",
+    "RAM is short for",
+    # Non-ASCII letters next to the acronym
+    "What does éTCP stand for?",
+    "What does TCPé stand for?",
+    "What is DBMSé?",
+    "What is ıP?",
+    "What is İP?",
+    "What does ſQL stand for?",
+    "Expand the acronym \u212aB",
+    "Full form of CPU\u00fc",
+    "ÄRAM is short for",
+    "RAM\u212a is short for",
+    "What is D\u0307B?",
+)
+
+
+class AcronymPatternTests(SimpleTestCase):
+    def test_acronym_patterns_match_original(self):
+        adjuster = english_rules.EnglishBloomAdjuster()
+        self.assertEqual(len(ORIGINAL_ACRONYM_PATTERNS), len(adjuster.ACRONYM_PATTERNS))
+        for question in ACRONYM_QUESTIONS:
+            text = question.lower().strip()
+            instance = adjuster._adjuster_for(text)
+            expected = [re.search(p, text, re.IGNORECASE) is not None for p in ORIGINAL_ACRONYM_PATTERNS]
+            got = [re.search(p, text, instance.flags) is not None for p in instance.ACRONYM_PATTERNS]
+            self.assertEqual(got, expected, question)
+            self.assertEqual(instance._has_acronym_pattern(text), any(expected), question)
+
+
+# Entries rewritten from a leading \b[\w\s]+\s+X to a linear form:
+# (module, list, original, rewritten, words that complete a match)
+LINEAR_REWRITES = (
+    (english_rules.EnglishBloomAdjuster, 'HISTORICAL_CREATOR_PATTERNS',
+     r'\b[\w\s]+\s+proposed\s+(?:the\s+)?[\w\s]+\s+(?:model|method|theory|concept)',
+     r'\w\s+proposed\s+(?:the\s+)?[\w\s]+\s+(?:model|method|theory|concept)',
+     'proposed the relativity theory'),
+    (english_rules.EnglishBloomAdjuster, 'DEFINITION_RECALL_PATTERNS',
+     r'\b[\w\s]+\s+refers\s+to\b', r'\w\s+refers\s+to\b', 'refers to'),
+    (english_rules.EnglishBloomAdjuster, 'DEFINITION_RECALL_PATTERNS',
+     r'\b[\w\s]+\s+means\s*:?\b', r'\w\s+means\s*:?\b', 'means :'),
+    (english_rules.EnglishBloomAdjuster, 'TECHNICAL_TERM_BLOCKERS',
+     r'\b[\w\s]+\s+poisoning\s+(?:is|attack|vulnerability)',
+     r'\w\s+poisoning\s+(?:is|attack|vulnerability)', 'poisoning attack'),
+    (english_rules.EnglishBloomAdjuster, 'ABSOLUTE_C1_BLOCKERS',
+     r'\b[\w\s]+\s+(?:is|are)\s*\.?\s*$', r'\w\s+(?:is|are)\s*\.?\s*$', 'is .'),
+    (english_rules.EnglishBloomAdjuster, 'FORCE_C1_PATTERNS',
+     r'\b[\w\s]+\s+poisoning\s+(?:is\s+)?(?:a|an)\s+(?:type|form)',
+     r'\w\s+poisoning\s+(?:is\s+)?(?:a|an)\s+(?:type|form)', 'poisoning is a type'),
+    (indonesian_rules.IndonesianBloomAdjuster, 'ABSOLUTE_C1_BLOCKERS',
+     r'\b[\w\s]+\s+disebut\s*\??$', r'(?:^|[^\w\s])\s*\w[\w\s]*\s+disebut\s*\??$', 'disebut ?'),
+    (indonesian_rules.IndonesianBloomAdjuster, 'ABSOLUTE_C1_BLOCKERS',
+     r'\b[\w\s]+\s+adalah\s*\.?\s*$', r'(?:^|[^\w\s])\s*\w[\w\s]*\s+adalah\s*\.?\s*$', 'adalah .'),
+    (indonesian_rules.IndonesianBloomAdjuster, 'ABSOLUTE_C1_BLOCKERS',
+     r'\b[\w\s]+\s+merupakan\s*\.?\s*$', r'(?:^|[^\w\s])\s*\w[\w\s]*\s+merupakan\s*\.?\s*$', 'merupakan'),
+    (indonesian_rules.IndonesianBloomAdjuster, 'ABSOLUTE_C1_BLOCKERS',
+     r'\b[\w\s]+\s+ialah\s*\.?\s*$', r'(?:^|[^\w\s])\s*\w[\w\s]*\s+ialah\s*\.?\s*$', 'ialah'),
+)
+
+LINEAR_PREFIXES = (
+    '', ' ', 'x', 'word ', 'two words  ', 'word\n', 'word \n ', '\n', '\n\n  ', '\tword\t',
+    '.', '. ', '?word ', '!  word  ', ', ', 'a, b ', '(x) ', '-- ', 'x.\n', 'end.\nnext ',
+    '_ ', '1 ', 'é ', 'word\x1c', 'word\xa0', 'ſ ', 'ı ',
+)
+
+LINEAR_SUFFIXES = ('', '?', ' .', '  \n', ' x', '.\n')
+
+
+def _linear_inputs(words, count=300):
+    """Fixed prefixes around words, plus seeded random strings built from its pieces"""
+    texts = [prefix + words + suffix for prefix in LINEAR_PREFIXES for suffix in LINEAR_SUFFIXES]
+    texts.extend(words.replace(' ', separator) for separator in ('  ', '\n', ' \n ', '\t'))
+    pieces = words.split() + ['a', 'bc', ' ', '  ', '\n', '\t', '.', '?', ',', ':', 'é', '_', '1']
+    rng = random.Random(words)
+    texts.extend(''.join(rng.choice(pieces) for _ in range(rng.randint(1, 10))) for _ in range(count))
+    return texts
+
+
+class LinearRewriteTests(SimpleTestCase):
+    def test_rewrites_match_original(self):
+        for adjuster_cls, list_name, original, rewritten, words in LINEAR_REWRITES:
+            with self.subTest(pattern=rewritten):
+                self.assertIn(rewritten, getattr(adjuster_cls, list_name))
+                outcomes = set()
+                for text in _linear_inputs(words):
+                    flag_sets = [re.IGNORECASE, re.UNICODE]
+                    if text.isascii():
+                        flag_sets.append(re.ASCII)
+                    for flags in flag_sets:
+                        expected = re.search(original, text, flags) is not None
+                        self.assertEqual(re.search(rewritten, text, flags) is not None, expected,
+                                         (text, flags))
+                        outcomes.add(expected)
+                self.assertEqual(outcomes, {True, False})
+
+
+class PatternGroupTests(SimpleTestCase):
+    def assertSameAsRe(self, groups):
+        matched = set()
+        for patterns, flags, group in groups:
+            for text in _corpus():
+                for limit in (1, 2):
+                    expected = _reference_count(patterns, flags, text, limit)
+                    self.assertEqual(group.count(text, limit), expected, (patterns, text, limit))
+                    if expected:
+                        matched.add(id(group))
+        # Every group must match somewhere, or the corpus proves nothing
+        self.assertEqual(len(matched), len(groups))
+
+    def test_gated_count_matches_plain_re(self):
+        self.assertSameAsRe(_build_groups())
+
+    def test_adjuster_groups_match_plain_re(self):
+        # The shared-scanner groups the adjuster uses, with whatever is installed
+        adjuster_cls = indonesian_rules.IndonesianBloomAdjuster
+        self.assertSameAsRe([
+            (getattr(adjuster_cls, name), flags, getattr(adjuster_cls, group))
+            for name, group, flags in PATTERN_LISTS
+        ])
+
+    def test_literal_gate_derivation(self):
+        # Breaks loudly if re's private parser or its opcodes change shape
+        parse = indonesian_rules.sre_parse.parse
+        literal_alternatives = indonesian_rules._literal_alternatives
+        literal_tail = indonesian_rules._literal_tail
+
+        self.assertEqual(literal_alternatives(parse(r'\bdefinisi\s+(?:dari|tentang|yang)')), {'definisi'})
+        self.assertEqual(literal_alternatives(parse(r'\b(?:adalah|merupakan|ialah)\s+[\w\s]+$')),
+                         {'adalah', 'merupakan', 'ialah'})
+        self.assertEqual(literal_alternatives(parse(r'\bterapkan(?:lah)?\s+')), {'terapkan'})
+        self.assertEqual(literal_alternatives(parse(r'\.{3,}')), {'...'})
+        self.assertEqual(literal_alternatives(parse(r'\bdi\s+mana\b')), {'mana'})
+        self.assertIsNone(literal_alternatives(parse(r'\b\w\s+\d+')))
+
+        self.assertEqual(literal_tail(parse(r'(?:^|[^\w\s])\s*\w[\w\s]*\s+disebut\s*\??$')), 'disebut')
+        self.assertEqual(literal_tail(parse(r'\bkecuali\s*:?\s*$')), 'kecuali')
+        self.assertIsNone(literal_tail(parse(r'\byaitu\s+[\w\s]+$')))
+        self.assertIsNone(literal_tail(parse(r'\bdisebut\s+apa')))
+
+        # Every shipped pattern is gated; a silent None here would only make
+        # matching slower, so fail instead
+        for name, _, _ in PATTERN_LISTS:
+            for pattern in getattr(indonesian_rules.IndonesianBloomAdjuster, name):
+                self.assertTrue(literal_alternatives(parse(pattern)), pattern)
+
+    @unittest.skipUnless(indonesian_rules.HYPERSCAN_AVAILABLE, "hyperscan not installed")
+    def test_hyperscan_count_matches_plain_re(self):
+        groups = _build_groups(hyperscan=True)
+        # Lookaround groups (e.g. FORCE_C2) cannot compile and stay on re
+        self.assertTrue(any(group.hyperscan_database is not None for _, _, group in groups))
+        self.assertTrue(any(group.hyperscan_database is None for _, _, group in groups))
+        self.assertSameAsRe(groups)
+
+    @unittest.skipUnless(indonesian_rules.HYPERSCAN_AVAILABLE, "hyperscan not installed")
+    def test_hyperscan_compile_failure_falls_back_to_re(self):
+        hyperscan = indonesian_rules.hyperscan
+
+        class FailingDatabase(hyperscan.Database):
+            def compile(self, *args, **kwargs):
+                raise hyperscan.error('compile failed')
+
+        with mock.patch.object(hyperscan, 'Database', FailingDatabase), \
+                self.assertLogs(indonesian_rules.logger, 'DEBUG') as logs:
+            groups = _build_groups(hyperscan=True)
+        self.assertTrue(all(group.hyperscan_database is None for _, _, group in groups))
+        self.assertIn('Hyperscan cannot compile pattern group', logs.output[0])
+        self.assertSameAsRe(groups)
+
+    @unittest.skipUnless(indonesian_rules.AHOCORASICK_AVAILABLE, "pyahocorasick not installed")
+    def test_aho_corasick_finds_same_gate_words_as_substring_search(self):
+        groups = [group for _, _, group in _build_groups(ahocorasick=True)]
+        literals = set().union(*(group._gate_literals() for group in groups))
+        scanner = indonesian_rules.LiteralScanner(literals)
+
+        for text in _corpus():
+            self.assertEqual(scanner.find(text), {literal for literal in literals if literal in text}, text)
+
+    @unittest.skipUnless(indonesian_rules.AHOCORASICK_AVAILABLE, "pyahocorasick not installed")
+    def test_aho_corasick_count_matches_plain_re(self):
+        groups = _build_groups(ahocorasick=True)
+        indonesian_rules.PatternGroup.share_literal_scanner([group for _, _, group in groups])
+        self.assertTrue(all(group.literal_scanner is groups[0][2].literal_scanner for _, _, group in groups))
+        self.assertSameAsRe(groups)
+
+    @unittest.skipUnless(indonesian_rules.AHOCORASICK_AVAILABLE, "pyahocorasick not installed")
+    def test_aho_corasick_gate_keeps_casefold_matches(self):
+        group = indonesian_rules.PatternGroup(indonesian_rules.IndonesianBloomAdjuster.FORCE_C6_PATTERNS)
+
+        # No gate word is present, yet IGNORECASE folds 'ſ' onto 's'
+        text = 'ſuſunlah ſtrategi pemasaran'
+        self.assertTrue(group.literal_scanner.find(text).isdisjoint(group.required_literals))
+        self.assertEqual(group.count(text), 1)
+        self.assertEqual(group.count('ſusun ıtu'), 0)
+
+    @unittest.skipUnless(indonesian_rules.RE2_AVAILABLE, "google-re2 not installed")
+    def test_re2_set_count_matches_plain_re(self):
+        groups = _build_groups(re2=True)
+        # Lookaround groups have no RE2 set and stay on re
+        self.assertTrue(any(group.re2_set is not None for _, _, group in groups))
+        self.assertTrue(any(group.re2_set is None for _, _, group in groups))
+        self.assertSameAsRe(groups)
+
+
+# Questions ending on the word an end-anchored pattern needs
+TAIL_STEMS = (
+    "proses perubahan wujud ini disebut",
+    "1. fotosintesis adalah",
+    "yang dimaksud dengan hukum adalah",
+    "ekosistem merupakan",
+    "atom ialah",
+    "teori evolusi dikemukakan oleh",
+    "alat ini dikenal dengan nama",
+    "surat itu disampaikan kepada",
+    "hak cipta diatur dalam pasal",
+    "ketentuan ini tercantum dalam pasal",
+    "semua benar, kecuali",
+    "istilah ini disebut juga",
+    "oleh karena itu",
+)
+
+TAIL_ENDINGS = (
+    '', '?', ' ?', '??', '?!', '.', ' .', '..', '...', ':', ' :', ' ', '   ',
+    '\n', ' \n', '\n\n', '?\n', '. \n', ' ?  \n', '\t', ' x',
+    ': ?', ' : ? ', '.:', '. ?\n', ':?', ' .\n',
+)
+
+# End-anchored shapes the tail gate must not take a word from: a word
+# ending in punctuation or whitespace, or a suffix count() does not strip
+TAIL_SHAPES = (
+    r'\bkecuali:$',
+    r'\bdisebut\?$',
+    r'\badalah \.$',
+    r'\bkecuali\s*[:.]?\s*\??\s*$',
+    r'\bkecuali[\s.:]*$',
+    r'\bdisebut\s*\.?\s*\??$',
+    r'\badalah \.?$',
+)
+
+
+class TailGateTests(SimpleTestCase):
+    def test_unstripped_shapes_are_not_gated(self):
+        for pattern in TAIL_SHAPES:
+            with self.subTest(pattern=pattern):
+                self.assertIsNone(indonesian_rules._literal_tail(indonesian_rules.sre_parse.parse(pattern)))
+
+    def test_tail_gate_matches_plain_re(self):
+        tail_patterns = [
+            (compiled.pattern, flags)
+            for _, flags, group in _build_groups()
+            for compiled, _, tail in group.gated if tail is not None
+        ]
+        self.assertTrue(tail_patterns)
+        tail_patterns.extend((pattern, 0) for pattern in TAIL_SHAPES)
+
+        with mock.patch.multiple(indonesian_rules, HYPERSCAN_AVAILABLE=False, RE2_AVAILABLE=False):
+            groups = [(pattern, flags, indonesian_rules.PatternGroup((pattern,))) for pattern, flags in tail_patterns]
+        for pattern, flags, group in groups:
+            matched = 0
+            for stem in TAIL_STEMS:
+                for ending in TAIL_ENDINGS:
+                    text = stem + ending
+                    expected = re.search(pattern, text, flags) is not None
+                    self.assertEqual(group.matches(text), expected, (pattern, text))
+                    matched += expected
+            self.assertTrue(matched, pattern)
+
+
+class BatchAdjustmentTests(SimpleTestCase):
+    def test_batch_matches_single_adjustment(self):
+        questions = [question for question in QUESTIONS for _ in PREDICTIONS]
+        predictions = [dict(prediction) for _ in QUESTIONS for prediction in PREDICTIONS]
+
+        single = indonesian_rules.IndonesianBloomAdjuster()
+        expected = [single.adjust_classification(q, p) for q, p in zip(questions, predictions)]
+        batch = indonesian_rules.IndonesianBloomAdjuster()
+        self.assertEqual(batch.adjust_classification_batch(questions, predictions), expected)
+        self.assertEqual(indonesian_rules.adjust_classification_batch_with_patterns(questions, predictions),
+                         expected)
+
+    def test_batch_rejects_mismatched_lengths(self):
+        adjuster = indonesian_rules.IndonesianBloomAdjuster()
+        with self.assertRaises(ValueError):
+            adjuster.adjust_classification_batch(["Apa itu atom?", "Hitunglah luas lingkaran."],
+                                                 [_prediction('C1', 0.9)])
+        with self.assertRaises(ValueError):
+            adjuster.adjust_classification_batch(["Apa itu atom?"], [])
+
+
+class DecisionCacheTests(SimpleTestCase):
+    def test_clear_decision_cache(self):
+        english_questions = ENGLISH_QUESTIONS + ("What ıs DBMS?", "What is DBMS café?")
+        for adjuster, questions in ((indonesian_rules.IndonesianBloomAdjuster(), QUESTIONS),
+                                    (english_rules.EnglishBloomAdjuster(), english_questions)):
+            with self.subTest(adjuster=type(adjuster).__name__):
+                expected = [adjuster.adjust_classification(q, _prediction('C3', 0.9)) for q in questions]
+                # The English fallback instances keep caches of their own
+                instances = [adjuster, *getattr(adjuster, '_fallback_adjusters', {}).values()]
+                self.assertTrue(all(i._cached_decision.cache_info().currsize for i in instances))
+
+                adjuster.clear_decision_cache()
+                self.assertEqual([i._cached_decision.cache_info().currsize for i in instances], [0] * len(instances))
+                self.assertEqual([adjuster.adjust_classification(q, _prediction('C3', 0.9)) for q in questions],
+                                 expected)
+
+
+@unittest.skipUnless(ONNX_STACK_AVAILABLE, "torch, transformers or onnxruntime not installed")
+@override_settings(BLOOM_QUANTIZE=False, BLOOM_TORCHSCRIPT=False, BLOOM_ONNX=False)
+class OnnxExportTests(SimpleTestCase):
+    def setUp(self):
+        # A small random RoBERTa with the shipped tokenizer, saved like the real one
+        self.model_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.model_dir)
+
+        source = Path(__file__).parent / 'roberta_multilabel'
+        for name in ('vocab.json', 'merges.txt', 'tokenizer.json', 'tokenizer_config.json', 'special_tokens_map.json'):
+            shutil.copy(source / name, self.model_dir / name)
+
+        config = transformers.AutoConfig.from_pretrained(source)
+        config.update({'hidden_size': 32, 'num_hidden_layers': 1, 'num_attention_heads': 2, 'intermediate_size': 37})
+        transformers.AutoModelForSequenceClassification.from_config(config).save_pretrained(self.model_dir)
+
+    def _classifier(self):
+        return ml_model.BloomClassifier(model_path=str(self.model_dir), use_pattern_adjusters=False)
+
+    def test_export_is_served_and_matches_pytorch(self):
+        onnx_path = self._classifier().export_onnx()
+        self.assertEqual(onnx_path, self.model_dir / 'model.onnx')
+        self.assertFalse(list(self.model_dir.glob('.model-*')))
+
+        with self.settings(BLOOM_ONNX=True):
+            classifier = self._classifier()
+        self.assertTrue(classifier.load_model())
+        self.assertIsNotNone(classifier.onnx_session)
+
+        inputs = classifier.tokenizer(["Hitunglah luas lingkaran.", "Define a variable in three words."],
+                                      return_tensors="pt", padding=True)
+        with torch.no_grad():
+            self.assertTrue(torch.allclose(classifier._logits(inputs), classifier.model(**inputs).logits, atol=1e-4))
+
+    def test_missing_or_stale_export_keeps_pytorch(self):
+        with self.settings(BLOOM_ONNX=True):
+            classifier = self._classifier()
+        self.assertTrue(classifier.load_model())
+        self.assertIsNone(classifier.onnx_session)
+        self.assertFalse((self.model_dir / 'model.onnx').exists())
+
+        onnx_path = self._classifier().export_onnx()
+        # Weights in another format, newer than the export
+        newer_weights = self.model_dir / 'pytorch_model.bin'
+        newer_weights.write_bytes(b'')
+        mtime = onnx_path.stat().st_mtime + 60
+        os.utime(newer_weights, (mtime, mtime))
+
+        with self.settings(BLOOM_ONNX=True):
+            classifier = self._classifier()
+        self.assertTrue(classifier.load_model())
+        self.assertIsNone(classifier.onnx_session)
+
+    def test_failed_export_keeps_previous_file(self):
+        previous = self.model_dir / 'model.onnx'
+        previous.write_bytes(b'previous export')
+
+        with mock.patch.object(torch.onnx, 'export', side_effect=RuntimeError('export failed')):
+            with self.assertRaisesMessage(RuntimeError, 'export failed'):
+                self._classifier().export_onnx()
+        self.assertEqual(previous.read_bytes(), b'previous export')
+        self.assertFalse(list(self.model_dir.glob('.model-*')))
@@ -24,7 +24,7 @@ def extract_questions_from_text(text):
     for q in questions:
         q = q.strip()
         # Only keep questions that are reasonable length and look like sentences
-        if len(q) > 20 and any(q.endswith(x) for x in '.!?'):
+        if len(q) > 20 and q.endswith(('.', '!', '?')):
             filtered_questions.append(q)
     
     return filtered_questions
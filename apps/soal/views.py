@@ -254,12 +254,9 @@ def process_classification_sync(history_id):
         
         # Apply Indonesian pattern-based adjustments
         logger.info("Applying Indonesian pattern adjustments...")
-        from apps.klasifikasi.indonesian_rules import adjust_classification_with_patterns
+        from apps.klasifikasi.indonesian_rules import adjust_classification_batch_with_patterns
         
-        adjusted_predictions = []
-        for question, pred in zip(questions, predictions):
-            adjusted = adjust_classification_with_patterns(question, pred)
-            adjusted_predictions.append(adjusted)
+        adjusted_predictions = adjust_classification_batch_with_patterns(questions, predictions)
         
         # Build classification results
         results = []